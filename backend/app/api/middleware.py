@@ -1,47 +1,55 @@
 import time
 import logging
 import uuid
-from typing import Callable
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """Enhanced logging middleware with request tracking"""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Generate request ID for tracking
         request_id = str(uuid.uuid4())[:8]
         start_time = time.time()
         
         # Log incoming request
+        client = scope.get("client")
         logger.info(
-            f"Request {request_id}: {request.method} {request.url.path} "
-            f"from {request.client.host if request.client else 'unknown'}"
+            "Request %s: %s %s from %s",
+            request_id, scope["method"], scope["path"], client[0] if client else "unknown"
         )
         
-        # Add request ID to state for use in endpoints
-        request.state.request_id = request_id
+        # Add request ID to state for use in endpoints (request.state.request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
+        
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration = time.time() - start_time
+                
+                # Log successful response
+                logger.info("Response %s: %s in %.3fs", request_id, message["status"], duration)
+                
+                # Add useful headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Response-Time"] = f"{duration:.3f}s"
+            await send(message)
         
         try:
             # Process request
-            response = await call_next(request)
-            duration = time.time() - start_time
-            
-            # Log successful response
-            logger.info(
-                f"Response {request_id}: {response.status_code} "
-                f"in {duration:.3f}s"
-            )
-            
-            # Add useful headers
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Response-Time"] = f"{duration:.3f}s"
-            
-            return response
+            await self.app(scope, receive, send_with_headers)
             
         except Exception as e:
             duration = time.time() - start_time
@@ -52,19 +60,32 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             )
             raise
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("X-XSS-Protection", "1; mode=block"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+)
+
+class SecurityHeadersMiddleware:
     """Add security headers to all responses"""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS:
+                    headers[name] = value
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 def setup_middleware(app: FastAPI) -> None:
     """Setup all middleware for the application"""
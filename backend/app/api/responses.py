@@ -0,0 +1,129 @@
+import gzip
+import hashlib
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+from pydantic_core import to_json
+
+
+class JSONFragment(bytes):
+    """Already-encoded JSON value that is spliced into a response as-is"""
+
+
+def render_json(content: Any) -> bytes:
+    """Encode plain data or pydantic models to compact UTF-8 JSON"""
+    return to_json(content)
+
+
+def render_object(fields: Iterable[Tuple[str, Any]]) -> bytes:
+    """
+    Encode (key, value) pairs as a JSON object, keeping their order
+
+    JSONFragment values are inserted verbatim; everything else goes
+    through render_json.
+    """
+    members = [
+        to_json(key) + b":" + (value if isinstance(value, JSONFragment) else to_json(value))
+        for key, value in fields
+    ]
+    return b"{" + b",".join(members) + b"}"
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that skips jsonable_encoder
+
+    Content is encoded by pydantic-core; bytes content is taken to be
+    already-rendered JSON and sent unchanged.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    Streaming response for endpoints that keep reading the request body
+    while they respond
+
+    StreamingResponse listens for client disconnects by calling receive(),
+    which would swallow request body chunks the endpoint has not read yet.
+    Here the body iterator owns receive(); a disconnect surfaces there as
+    ClientDisconnect instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """One Server-Sent Events message with a JSON payload"""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + to_json(data) + b"\n\n"
+
+
+# Same threshold as the GZipMiddleware in setup_middleware
+GZIP_MINIMUM_SIZE = 1000
+
+
+def make_etag(version: str, key: Any) -> str:
+    """Strong ETag for the representation ``key`` of data at ``version``"""
+    digest = hashlib.sha256(f"{version}:{key!r}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+class PrerenderedJSON(NamedTuple):
+    """A JSON body rendered once, with its gzip encoding and strong ETag"""
+    body: bytes
+    gzipped: Optional[bytes]
+    etag: str
+
+    @classmethod
+    def build(cls, content: Any, etag: str) -> "PrerenderedJSON":
+        body = render_json(content)
+        gzipped = gzip.compress(body, compresslevel=9, mtime=0) if len(body) >= GZIP_MINIMUM_SIZE else None
+        return cls(body, gzipped, etag)
+
+
+def _gzip_etag(etag: str) -> str:
+    return etag[:-1] + '-gzip"'
+
+
+def matching_etag(request: Request, etag: str) -> Optional[str]:
+    """
+    The tag in If-None-Match that names ``etag`` or its gzip variant
+    (weak comparison), or None if the client's copy is not current
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return etag
+        if tag.removeprefix("W/") in (etag, _gzip_etag(etag)):
+            return tag.removeprefix("W/")
+    return None
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """304 reply; no body is rendered"""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    )
+
+
+def prerendered_response(request: Request, prerendered: PrerenderedJSON, cache_control: str) -> Response:
+    """Serve a pre-rendered body, gzipped when the client accepts it"""
+    headers = {"ETag": prerendered.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if prerendered.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        headers["ETag"] = _gzip_etag(prerendered.etag)
+        headers["Content-Encoding"] = "gzip"
+        return FastJSONResponse(prerendered.gzipped, headers=headers)
+    return FastJSONResponse(prerendered.body, headers=headers)
@@ -1,21 +1,48 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, List, Tuple
+from collections import OrderedDict
 import logging
 from datetime import datetime
 
+from ..core.bulk import SHEET_FORMATS, BulkClassifier, iter_lines
 from ..core.classifier import TaqneeqClassifier
+from ..core.session_store import InMemorySessionStore
 from ..core.models import (
-    StartSessionRequest, AnswerQuestionRequest, ExplanationRequest,
+    StartSessionRequest, AnswerQuestionRequest, BatchAnswerRequest, ExplanationRequest,
     ClassificationResult, SessionState
 )
-from ..rag.engine import TaqneeqRAG
+from ..rag.engine import ExplanationStream, TaqneeqRAG
+from ..rag.sections import EXPLANATION_SECTIONS
 from ..config import settings
+from .responses import (
+    FastJSONResponse, JSONFragment, PrerenderedJSON, RequestStreamingResponse,
+    make_etag, matching_etag, not_modified, prerendered_response, render_json, render_object, sse_event
+)
 
 logger = logging.getLogger(__name__)
 
-# Initialize global instances
+# Initialize global instances (the RAG engine warms up in the background, see main.lifespan)
 classifier = TaqneeqClassifier()
 rag_engine = TaqneeqRAG(classifier.departments) if settings.ENABLE_RAG else None
+bulk_classifier = BulkClassifier(classifier, settings.BULK_WORKERS, settings.BULK_CHUNK_SIZE)
+
+# Questions never change after load, so their JSON is encoded once
+question_payloads = {
+    question_id: JSONFragment(render_json(question))
+    for question_id, question in classifier.questions.items()
+}
+
+# Other session backends (and their usage counters) block on disk I/O and
+# lock waits, so their calls run in the threadpool instead of the event loop
+SESSION_STORE_BLOCKS = not isinstance(classifier.sessions, InMemorySessionStore)
+
+async def _session_io(func, *args):
+    """Call ``func``, in the threadpool if it may block on the session backend"""
+    if SESSION_STORE_BLOCKS:
+        return await run_in_threadpool(func, *args)
+    return func(*args)
 
 router = APIRouter()
 
@@ -25,34 +52,23 @@ router = APIRouter()
 async def start_classification(request: StartSessionRequest):
     """Start new classification session"""
     try:
-        session_id, first_question = classifier.start_session()
-        
-        response_data = {
-            "session_id": session_id,
-            "first_question": {
-                "id": first_question.id,
-                "text": first_question.text,
-                "type": first_question.type,
-                "options": first_question.options,
-                "category": first_question.category,
-                "primary_trait": first_question.primary_trait,
-                "secondary_traits": first_question.secondary_traits,
-                "information_value": first_question.information_value,
-                "target_departments": first_question.target_departments,
-                "question_stage": first_question.question_stage
-            },
-            "total_departments": len(classifier.departments),
-            "estimated_questions": "8-12 questions typically needed",
-            "message": "Welcome to Taqneeq Department Classification! Answer honestly for best results.",
-            "features": {
+        session_id, first_question = await _session_io(classifier.start_session)
+        
+        response_data = render_object((
+            ("session_id", session_id),
+            ("first_question", question_payloads[first_question.id]),
+            ("total_departments", len(classifier.departments)),
+            ("estimated_questions", "8-12 questions typically needed"),
+            ("message", "Welcome to Taqneeq Department Classification! Answer honestly for best results."),
+            ("features", {
                 "adaptive_questioning": True,
                 "rag_explanations": rag_engine is not None and rag_engine.initialized,
                 "trait_based_matching": True
-            }
-        }
+            })
+        ))
         
-        logger.info(f"Started classification session {session_id}")
-        return response_data
+        logger.info("Started classification session %s", session_id)
+        return FastJSONResponse(response_data)
         
     except Exception as e:
         logger.error(f"Failed to start classification: {e}")
@@ -61,61 +77,37 @@ async def start_classification(request: StartSessionRequest):
             detail=f"Failed to start classification session: {str(e)}"
         )
 
+def _render_answer_response(next_question, result: ClassificationResult, **extra) -> bytes:
+    """Body for the answer endpoints: next question, result and a status message"""
+    return render_object((
+        ("next_question", question_payloads[next_question.id] if next_question else None),
+        ("classification_result", result),
+        ("message", (
+            f"Classification complete! Top match: {result.top_department} "
+            f"({result.top_probability:.1%} confidence)"
+            if result.is_complete else
+            f"Question {result.questions_asked} processed - {result.reasoning}"
+        )),
+        *extra.items()
+    ))
+
 @router.post("/classification/answer")
 async def submit_answer(request: AnswerQuestionRequest):
     """Submit answer and get next question or results"""
     try:
-        next_question, result = classifier.process_response(
+        next_question, result = await _session_io(
+            classifier.process_response,
             request.session_id,
             request.question_id,
             request.response,
             request.confidence
         )
         
-        # Format next question data
-        next_question_data = None
-        if next_question:
-            next_question_data = {
-                "id": next_question.id,
-                "text": next_question.text,
-                "type": next_question.type,
-                "options": next_question.options,
-                "category": next_question.category,
-                "primary_trait": next_question.primary_trait,
-                "secondary_traits": next_question.secondary_traits,
-                "information_value": next_question.information_value,
-                "target_departments": next_question.target_departments,
-                "question_stage": next_question.question_stage
-            }
+        response_data = _render_answer_response(next_question, result)
         
-        # Create response
-        response_data = {
-            "next_question": next_question_data,
-            "classification_result": {
-                "session_id": result.session_id,
-                "top_department": result.top_department,
-                "top_probability": result.top_probability,
-                "secondary_department": result.secondary_department,
-                "secondary_probability": result.secondary_probability,
-                "all_probabilities": result.all_probabilities,
-                "questions_asked": result.questions_asked,
-                "confidence_level": result.confidence_level,
-                "should_continue": result.should_continue,
-                "is_complete": result.is_complete,
-                "current_top_traits": result.current_top_traits,
-                "reasoning": result.reasoning
-            },
-            "message": (
-                f"Classification complete! Top match: {result.top_department} "
-                f"({result.top_probability:.1%} confidence)"
-                if result.is_complete else
-                f"Question {result.questions_asked} processed - {result.reasoning}"
-            )
-        }
-        
-        logger.info(f"Processed answer for session {request.session_id}, "
-                   f"complete={result.is_complete}")
-        return response_data
+        logger.info("Processed answer for session %s, complete=%s",
+                    request.session_id, result.is_complete)
+        return FastJSONResponse(response_data)
         
     except ValueError as e:
         logger.warning(f"Invalid request: {e}")
@@ -127,42 +119,98 @@ async def submit_answer(request: AnswerQuestionRequest):
             detail=f"Failed to process answer: {str(e)}"
         )
 
-@router.post("/classification/explanation")
-async def get_explanation(request: ExplanationRequest):
-    """Get RAG-powered or template explanation for classification result"""
+@router.post("/classification/answers:batch")
+async def submit_answers_batch(request: BatchAnswerRequest):
+    """Submit buffered answers in order and get the next question or results"""
     try:
-        session = classifier.sessions.get(request.session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
+        next_question, result = await _session_io(
+            classifier.process_responses,
+            request.session_id,
+            [(answer.question_id, answer.response, answer.confidence) for answer in request.answers]
+        )
         
-        # Determine target department
-        dept_id = request.department_id
-        if not dept_id and session.department_probabilities:
-            dept_id = max(session.department_probabilities.items(), key=lambda x: x[1])[0]
+        response_data = _render_answer_response(
+            next_question, result, answers_applied=len(request.answers)
+        )
         
-        if not dept_id:
-            raise HTTPException(status_code=400, detail="No department specified or determined")
+        logger.info("Processed %d answers for session %s, complete=%s",
+                    len(request.answers), request.session_id, result.is_complete)
+        return FastJSONResponse(response_data)
         
-        department = classifier.departments.get(dept_id)
-        if not department:
-            raise HTTPException(status_code=400, detail="Department not found")
+    except ValueError as e:
+        logger.warning(f"Invalid request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to process answers: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to process answers: {str(e)}"
+        )
+
+@router.post("/classification/bulk")
+async def classify_bulk(
+    request: Request,
+    format: str = Query("jsonl", description="Answer sheet format: jsonl or csv")
+):
+    """Score uploaded answer sheets, streaming one JSON line per row back"""
+    if format not in SHEET_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of {', '.join(SHEET_FORMATS)}")
+    
+    async def results():
+        rows = 0
+        async for row in bulk_classifier.classify_stream(iter_lines(request.stream()), format):
+            rows += 1
+            yield render_json(row) + b"\n"
+        logger.info("Bulk classified %d answer sheets", rows)
+    
+    return RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+async def _explanation_target(session_id: str, department_id: Optional[str]):
+    """Session, department id and department an explanation is for"""
+    session = await _session_io(classifier.sessions.get, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    # Determine target department
+    dept_id = department_id
+    if not dept_id:
+        dept_id = session.top_department
+    
+    if not dept_id:
+        raise HTTPException(status_code=400, detail="No department specified or determined")
+    
+    department = classifier.departments.get(dept_id)
+    if not department:
+        raise HTTPException(status_code=400, detail="Department not found")
+    
+    return session, dept_id, department
+
+def _basic_explanation(session, department) -> dict:
+    """Simple fallback explanation when RAG is disabled"""
+    top_traits = session.get_top_traits(3)
+    return {
+        "overview": f"Based on your responses, you are well-suited for the {department.name} department.",
+        "why_good_fit": f"Your top traits ({', '.join([trait for trait, _ in top_traits])}) align with {department.name}'s requirements.",
+        "responsibilities": "; ".join(department.core_responsibilities[:3]),
+        "skills_gained": "; ".join(department.skills_perks_gained[:3]),
+        "next_steps": f"Apply to {department.name} and connect with current members."
+    }
+
+@router.post("/classification/explanation")
+async def get_explanation(request: ExplanationRequest):
+    """Get RAG-powered or template explanation for classification result"""
+    try:
+        session, dept_id, department = await _explanation_target(request.session_id, request.department_id)
         
-        # Generate explanation
+        # Generate explanation (the engine reports the method it ended up using)
         if rag_engine:
-            explanation = rag_engine.generate_explanation(dept_id, session)
+            explanation, generation_method = await rag_engine.generate_explanation_async(dept_id, session)
         else:
-            # Simple fallback explanation
-            top_traits = session.get_top_traits(3)
-            explanation = {
-                "overview": f"Based on your responses, you are well-suited for the {department.name} department.",
-                "why_good_fit": f"Your top traits ({', '.join([trait for trait, _ in top_traits])}) align with {department.name}'s requirements.",
-                "responsibilities": "; ".join(department.core_responsibilities[:3]),
-                "skills_gained": "; ".join(department.skills_perks_gained[:3]),
-                "next_steps": f"Apply to {department.name} and connect with current members."
-            }
+            explanation, generation_method = _basic_explanation(session, department), "template"
         
         # Get classification confidence
-        confidence = session.department_probabilities.get(dept_id, 0.0)
+        department_probabilities = session.department_probabilities
+        confidence = department_probabilities.get(dept_id, 0.0)
         
         # Build response
         response_data = {
@@ -174,13 +222,13 @@ async def get_explanation(request: ExplanationRequest):
             "user_top_traits": session.get_top_traits(5),
             "alternative_departments": [],
             "generated_at": datetime.now().isoformat(),
-            "generation_method": "rag" if (rag_engine and rag_engine.initialized) else "template"
+            "generation_method": generation_method
         }
         
         # Add alternative departments if requested
-        if request.include_comparison and len(session.department_probabilities) > 1:
+        if request.include_comparison and len(department_probabilities) > 1:
             sorted_depts = sorted(
-                session.department_probabilities.items(),
+                department_probabilities.items(),
                 key=lambda x: x[1],
                 reverse=True
             )[1:4]  # Get top 2-4 alternatives
@@ -195,8 +243,7 @@ async def get_explanation(request: ExplanationRequest):
                         "description": alt_dept.description[:150] + "..."
                     })
         
-        logger.info(f"Generated explanation for session {request.session_id}, "
-                   f"department {dept_id}")
+        logger.info("Generated explanation for session %s, department %s", request.session_id, dept_id)
         return response_data
         
     except HTTPException:
@@ -208,11 +255,62 @@ async def get_explanation(request: ExplanationRequest):
             detail=f"Failed to generate explanation: {str(e)}"
         )
 
+@router.get("/classification/explanation/stream")
+async def stream_explanation(
+    session_id: str = Query(..., description="Classification session"),
+    department_id: Optional[str] = Query(None, description="Department to explain (default: top match)")
+):
+    """
+    Stream the explanation as Server-Sent Events
+    
+    Events: ``start`` (department and section order), ``token`` ({section,
+    text}, in order), ``reset`` (discard the tokens so far; the LLM failed
+    and a fallback follows), then ``done`` with the complete sections, or
+    ``error``. Cached and template explanations arrive at once, one token
+    per section.
+    """
+    session, dept_id, department = await _explanation_target(session_id, department_id)
+    if rag_engine:
+        stream = await rag_engine.stream_explanation(dept_id, session)
+    else:
+        stream = ExplanationStream("template", _basic_explanation(session, department))
+    
+    async def events():
+        yield sse_event("start", {
+            "session_id": session_id,
+            "department_id": dept_id,
+            "department_name": department.name,
+            "sections": EXPLANATION_SECTIONS
+        })
+        try:
+            async for section, text in stream:
+                if section is None:
+                    yield sse_event("reset", {})
+                else:
+                    yield sse_event("token", {"section": section, "text": text})
+        except Exception as e:
+            logger.error(f"Failed to stream explanation: {e}")
+            yield sse_event("error", {"detail": f"Failed to generate explanation: {str(e)}"})
+            return
+        
+        yield sse_event("done", {
+            "explanation": stream.explanation,
+            "generation_method": stream.method,
+            "generated_at": datetime.now().isoformat()
+        })
+        logger.info("Streamed explanation for session %s, department %s", session_id, dept_id)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/classification/status/{session_id}")
 async def get_session_status(session_id: str):
     """Get current status of classification session"""
     try:
-        status = classifier.get_session_status(session_id)
+        status = await _session_io(classifier.get_session_status, session_id)
         if not status:
             raise HTTPException(status_code=404, detail="Session not found")
         
@@ -229,51 +327,89 @@ async def get_session_status(session_id: str):
 
 # DEPARTMENT ENDPOINTS
 
+def _department_summary(dept, include_traits: bool) -> dict:
+    """Listing entry for one department"""
+    dept_info = {
+        "id": dept.id,
+        "name": dept.name,
+        "description": dept.description,
+        "core_responsibilities": dept.core_responsibilities[:3],
+        "example_tasks": dept.example_tasks[:2],
+        "target_audience": dept.target_audience
+    }
+    
+    if include_traits:
+        dept_info["top_traits"] = dept.get_top_traits(5)
+        dept_info["trait_weights"] = dept.trait_weights
+    
+    return dept_info
+
+# Listing entries only change with the department data, so they are built once
+department_summaries = {
+    include_traits: {
+        dept_id: _department_summary(dept, include_traits)
+        for dept_id, dept in classifier.departments.items()
+    }
+    for include_traits in (False, True)
+}
+
+# Catalog responses are cacheable until departments.json changes
+CATALOG_CACHE_CONTROL = f"public, max-age={settings.CATALOG_CACHE_MAX_AGE}"
+
+def _department_list(search: Optional[str], include_traits: bool) -> PrerenderedJSON:
+    """Render the department listing for one parameter combination"""
+    # Apply search filter if provided (best matches first)
+    if search:
+        department_ids = classifier.department_search.search(search)
+    else:
+        department_ids = list(classifier.departments)
+    
+    summaries = department_summaries[include_traits]
+    result = [summaries[dept_id] for dept_id in department_ids]
+    return PrerenderedJSON.build(
+        {
+            "departments": result,
+            "total": len(result),
+            "search_applied": search is not None,
+            "traits_included": include_traits
+        },
+        make_etag(classifier.departments_hash, ("departments", search, include_traits))
+    )
+
+# Unfiltered listings are rendered up front; searches are kept per
+# (search, include_traits), least recently used first
+department_listings = {
+    include_traits: _department_list(None, include_traits) for include_traits in (False, True)
+}
+department_list_cache: "OrderedDict[Tuple[str, bool], PrerenderedJSON]" = OrderedDict()
+
 @router.get("/departments")
 async def list_departments(
+    request: Request,
     include_traits: bool = Query(False, description="Include trait weights"),
-    search: Optional[str] = Query(None, description="Search by name or description")
+    search: Optional[str] = Query(None, description="Search by name, description, responsibilities, skills or tasks")
 ):
-    """Get list of all departments with optional filtering"""
+    """Get list of all departments with optional ranked search"""
     try:
-        departments = list(classifier.departments.values())
-        
-        # Apply search filter if provided
-        if search:
-            search_lower = search.lower()
-            departments = [
-                dept for dept in departments
-                if (search_lower in dept.name.lower() or
-                    search_lower in dept.description.lower() or
-                    any(search_lower in resp.lower() for resp in dept.core_responsibilities))
-            ]
+        etag = make_etag(classifier.departments_hash, ("departments", search, include_traits))
+        client_etag = matching_etag(request, etag)
+        if client_etag:
+            return not_modified(client_etag, CATALOG_CACHE_CONTROL)
         
-        # Build response
-        result = []
-        for dept in departments:
-            dept_info = {
-                "id": dept.id,
-                "name": dept.name,
-                "description": dept.description,
-                "core_responsibilities": dept.core_responsibilities[:3],
-                "example_tasks": dept.example_tasks[:2],
-                "target_audience": dept.target_audience
-            }
-            
-            if include_traits:
-                dept_info["top_traits"] = dept.get_top_traits(5)
-                dept_info["trait_weights"] = dept.trait_weights
-            
-            result.append(dept_info)
+        if search is None:
+            listing = department_listings[include_traits]
+        else:
+            cache_key = (search, include_traits)
+            listing = department_list_cache.get(cache_key)
+            if listing is None:
+                listing = department_list_cache[cache_key] = _department_list(search, include_traits)
+                if len(department_list_cache) > settings.DEPARTMENT_SEARCH_CACHE_SIZE:
+                    department_list_cache.popitem(last=False)
+            else:
+                department_list_cache.move_to_end(cache_key)
         
-        logger.info(f"Listed {len(result)} departments, search='{search}', "
-                   f"include_traits={include_traits}")
-        return {
-            "departments": result,
-            "total": len(result),
-            "search_applied": search is not None,
-            "traits_included": include_traits
-        }
+        logger.info("Listed departments, search='%s', include_traits=%s", search, include_traits)
+        return prerendered_response(request, listing, CATALOG_CACHE_CONTROL)
         
     except Exception as e:
         logger.error(f"Failed to list departments: {e}")
@@ -282,46 +418,64 @@ async def list_departments(
             detail="Failed to retrieve departments"
         )
 
+def _department_details(department, include_traits: bool) -> PrerenderedJSON:
+    """Render the detail view of one department"""
+    result = {
+        "id": department.id,
+        "name": department.name,
+        "description": department.description,
+        "core_responsibilities": department.core_responsibilities,
+        "skills_required": department.skills_required,
+        "soft_skills_required": department.soft_skills_required,
+        "skills_perks_gained": department.skills_perks_gained,
+        "example_tasks": department.example_tasks,
+        "target_audience": department.target_audience
+    }
+    
+    if include_traits:
+        result["top_traits"] = department.get_top_traits(10)
+        result["trait_weights"] = department.trait_weights
+        result["trait_analysis"] = {
+            "highest_weight": max(department.trait_weights.values()),
+            "critical_traits": [
+                trait for trait, weight in department.trait_weights.items()
+                if weight > 0.9
+            ],
+            "important_traits": [
+                trait for trait, weight in department.trait_weights.items()
+                if 0.7 <= weight <= 0.9
+            ]
+        }
+    
+    return PrerenderedJSON.build(
+        result,
+        make_etag(classifier.departments_hash, ("department", department.id, include_traits))
+    )
+
+department_details = {
+    (dept_id, include_traits): _department_details(dept, include_traits)
+    for dept_id, dept in classifier.departments.items()
+    for include_traits in (False, True)
+}
+
 @router.get("/departments/{department_id}")
 async def get_department_details(
+    request: Request,
     department_id: str,
     include_traits: bool = Query(True, description="Include trait analysis")
 ):
     """Get detailed information about a specific department"""
     try:
-        department = classifier.departments.get(department_id)
-        if not department:
+        details = department_details.get((department_id, include_traits))
+        if not details:
             raise HTTPException(status_code=404, detail="Department not found")
         
-        result = {
-            "id": department.id,
-            "name": department.name,
-            "description": department.description,
-            "core_responsibilities": department.core_responsibilities,
-            "skills_required": department.skills_required,
-            "soft_skills_required": department.soft_skills_required,
-            "skills_perks_gained": department.skills_perks_gained,
-            "example_tasks": department.example_tasks,
-            "target_audience": department.target_audience
-        }
-        
-        if include_traits:
-            result["top_traits"] = department.get_top_traits(10)
-            result["trait_weights"] = department.trait_weights
-            result["trait_analysis"] = {
-                "highest_weight": max(department.trait_weights.values()),
-                "critical_traits": [
-                    trait for trait, weight in department.trait_weights.items()
-                    if weight > 0.9
-                ],
-                "important_traits": [
-                    trait for trait, weight in department.trait_weights.items()
-                    if 0.7 <= weight <= 0.9
-                ]
-            }
+        client_etag = matching_etag(request, details.etag)
+        if client_etag:
+            return not_modified(client_etag, CATALOG_CACHE_CONTROL)
         
-        logger.info(f"Retrieved details for department {department_id}")
-        return result
+        logger.info("Retrieved details for department %s", department_id)
+        return prerendered_response(request, details, CATALOG_CACHE_CONTROL)
         
     except HTTPException:
         raise
@@ -343,22 +497,9 @@ async def get_similar_departments(
         if not target_dept:
             raise HTTPException(status_code=404, detail="Department not found")
         
-        # Calculate similarities with other departments
-        similarities = []
-        for other_id, other_dept in classifier.departments.items():
-            if other_id != department_id:
-                from ..core.utils import cosine_similarity
-                similarity = cosine_similarity(
-                    target_dept.trait_weights,
-                    other_dept.trait_weights
-                )
-                similarities.append((other_dept, similarity))
-        
-        # Sort by similarity and get top results
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
         result = []
-        for dept, similarity in similarities[:limit]:
+        for other_id, similarity in classifier.get_similar_departments(department_id, limit):
+            dept = classifier.departments[other_id]
             result.append({
                 "id": dept.id,
                 "name": dept.name,
@@ -372,7 +513,7 @@ async def get_similar_departments(
                 )
             })
         
-        logger.info(f"Found {len(result)} similar departments to {department_id}")
+        logger.info("Found %d similar departments to %s", len(result), department_id)
         return {
             "target_department": {
                 "id": target_dept.id,
@@ -401,6 +542,7 @@ async def health_check():
         dept_count = len(classifier.departments)
         question_count = len(classifier.questions)
         seed_count = len(classifier.seed_questions)
+        active_sessions = await _session_io(len, classifier.sessions)
         
         # Test classification engine
         if dept_count == 0 or question_count == 0:
@@ -415,6 +557,8 @@ async def health_check():
         if rag_engine:
             if rag_engine.initialized:
                 rag_status = "operational"
+            elif rag_engine.state in ("pending", "warming_up"):
+                rag_status = "warming_up"
             else:
                 rag_status = "failed_initialization"
         
@@ -423,14 +567,29 @@ async def health_check():
             "timestamp": datetime.now().isoformat(),
             "service": "Taqneeq Department Classifier",
             "version": "2.0.0",
+            # Live once the process answers; ready to classify as soon as data is loaded.
+            # RAG warms up separately and only affects explanation quality
+            "liveness": "alive",
+            "readiness": {
+                "ready": status == "healthy",
+                "classification": "ready" if status == "healthy" else "not_ready",
+                "rag": rag_engine.status() if rag_engine else {"state": "disabled"}
+            },
             "components": {
                 "departments_loaded": dept_count,
                 "questions_loaded": question_count,
                 "seed_questions": seed_count,
-                "active_sessions": len(classifier.sessions),
+                "active_sessions": active_sessions,
                 "classification_engine": "operational" if dept_count > 0 else "failed",
                 "rag_system": rag_status,
-                "vector_store": "ready" if (rag_engine and rag_engine.vector_store) else "unavailable"
+                "vector_store": "ready" if (rag_engine and rag_engine.vector_store) else "unavailable",
+                "decision_cache": (
+                    classifier.decision_cache.get_stats() if classifier.decision_cache is not None else "disabled"
+                ),
+                "explanation_cache": (
+                    rag_engine.explanation_cache.get_stats()
+                    if rag_engine and rag_engine.explanation_cache is not None else "disabled"
+                )
             },
             "configuration": {
                 "confidence_threshold": settings.CONFIDENCE_THRESHOLD,
@@ -454,53 +613,36 @@ async def health_check():
         }
 
 @router.get("/stats")
-async def get_usage_statistics():
+async def get_usage_statistics(
+    include_windows: bool = Query(False, description="Include event counts for the last 5 minutes and hour")
+):
     """Get system usage statistics and analytics"""
     try:
-        sessions = list(classifier.sessions.values())
-        completed_sessions = [s for s in sessions if s.state == SessionState.COMPLETE]
-        active_sessions = [s for s in sessions if s.state in [SessionState.SEED_QUESTIONS, SessionState.ADAPTIVE_QUESTIONS]]
-        
-        # Department popularity among completed sessions
-        dept_counts = {}
-        for session in completed_sessions:
-            if session.department_probabilities:
-                top_dept = max(session.department_probabilities.items(), key=lambda x: x[1])[0]
-                dept_counts[top_dept] = dept_counts.get(top_dept, 0) + 1
-        
-        # Response analysis
-        all_responses = []
-        question_counts = []
-        for session in sessions:
-            all_responses.extend([r.response for r in session.responses])
-            question_counts.append(len(session.responses))
+        usage = await _session_io(classifier.usage_stats.snapshot)
+        total_sessions = usage["total_sessions"]
+        completed_sessions = usage["sessions_by_state"][SessionState.COMPLETE]
+        active_sessions = (
+            usage["sessions_by_state"][SessionState.SEED_QUESTIONS] +
+            usage["sessions_by_state"][SessionState.ADAPTIVE_QUESTIONS]
+        )
         
         # Calculate statistics
-        avg_questions = sum(question_counts) / len(question_counts) if question_counts else 0
-        completion_rate = len(completed_sessions) / len(sessions) if sessions else 0
-        
-        # Response distribution
-        response_dist = {}
-        for response in all_responses:
-            response_dist[str(response)] = response_dist.get(str(response), 0) + 1
+        avg_questions = usage["total_responses"] / total_sessions if total_sessions else 0
+        completion_rate = completed_sessions / total_sessions if total_sessions else 0
         
         stats_data = {
             "summary": {
-                "total_sessions": len(sessions),
-                "completed_sessions": len(completed_sessions),
-                "active_sessions": len(active_sessions),
+                "total_sessions": total_sessions,
+                "completed_sessions": completed_sessions,
+                "active_sessions": active_sessions,
                 "completion_rate": round(completion_rate, 3)
             },
             "metrics": {
                 "average_questions_per_session": round(avg_questions, 1),
-                "total_responses": len(all_responses),
-                "response_distribution": response_dist
+                "total_responses": usage["total_responses"],
+                "response_distribution": usage["response_distribution"]
             },
-            "popular_departments": sorted(
-                dept_counts.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:5],
+            "popular_departments": usage["completed_by_department"][:5],
             "system_info": {
                 "departments_available": len(classifier.departments),
                 "questions_in_bank": len(classifier.questions),
@@ -509,6 +651,10 @@ async def get_usage_statistics():
             "timestamp": datetime.now().isoformat()
         }
         
+        if include_windows:
+            windows = await _session_io(classifier.usage_stats.windows)
+            stats_data["activity"] = {"all_time": usage["events"], **windows}
+        
         return stats_data
         
     except Exception as e:
@@ -522,12 +668,10 @@ async def get_usage_statistics():
 async def cleanup_sessions(max_age_hours: int = Query(24, ge=1, le=168)):
     """Clean up old sessions (admin endpoint)"""
     try:
-        initial_count = len(classifier.sessions)
-        classifier.cleanup_expired_sessions(max_age_hours)
-        final_count = len(classifier.sessions)
-        cleaned = initial_count - final_count
+        cleaned = await _session_io(classifier.cleanup_expired_sessions, max_age_hours)
+        final_count = await _session_io(len, classifier.sessions)
         
-        logger.info(f"Session cleanup: removed {cleaned} sessions older than {max_age_hours}h")
+        logger.info("Session cleanup: removed %d sessions older than %dh", cleaned, max_age_hours)
         
         return {
             "sessions_removed": cleaned,
@@ -1,5 +1,5 @@
 import os
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -10,6 +10,8 @@ class Settings(BaseSettings):
     PORT: int = 8000
     DEBUG: bool = False
     RELOAD: bool = False
+    WORKERS: int = 1  # >1 pre-forks workers from run.py (needs SESSION_BACKEND=sqlite)
+    WORKER_MAX_REQUESTS: int = 0  # Recycle a worker after this many requests (0 = never)
     
     # Frontend URL for CORS (configurable)
     FRONTEND_URL: str = "http://localhost:3000"
@@ -23,13 +25,44 @@ class Settings(BaseSettings):
     MIN_QUESTIONS: int = 4   # Minimum seed questions
     MIN_ADAPTIVE_QUESTIONS: int = 8  # Increased from 2 - force at least 6 adaptive questions
     LEARNING_RATE: float = 0.4  # Increased from 0.3 for faster learning
+    DECISION_TREE_DEPTH: int = 4  # Answers covered by the precompiled decision tree (0 disables)
+    DECISION_CACHE_SIZE: int = 20000  # Cross-session next-question decisions kept in memory (0 disables)
+    DECISION_CACHE_QUANTUM: float = 1e-6  # Trait score resolution used for decision cache keys
+    
+    # Session storage
+    SESSION_BACKEND: str = "memory"  # "memory" (single process) or "sqlite" (shared by workers on one host)
+    SESSION_SHARDS: int = 16  # Hash shards (each with its own lock) in the in-memory store
+    SESSION_DB_FILE: str = "app/data/sessions.db"
+    
+    # Bulk classification
+    BULK_WORKERS: int = 0  # Processes used to score uploaded answer sheets (0 = one per CPU)
+    BULK_CHUNK_SIZE: int = 256  # Answer sheets handed to a worker at a time
+    
+    # Catalog settings
+    DEPARTMENT_SEARCH_CACHE_SIZE: int = 512  # Rendered department search results kept per (query, include_traits)
+    CATALOG_CACHE_MAX_AGE: int = 300  # Cache-Control max-age (seconds) for department endpoints
+    
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json" (one object per line)
+    LOG_ASYNC: bool = True  # Queue records and write them from a background thread
+    LOG_SAMPLE_RATES: Dict[str, float] = {}  # Logger name -> fraction of records kept, e.g. {"app.core.classifier.decisions": 0.05}
     
     # RAG settings
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None  # OpenAI-compatible endpoint, e.g. benchmarks/stub_llm.py
+    LLM_MAX_CONCURRENCY: int = 8  # LLM explanation calls in flight per process
+    LLM_TIMEOUT: float = 20.0  # Seconds before an LLM explanation falls back to the template
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     ENABLE_RAG: bool = True
     SIMILARITY_THRESHOLD: float = 0.7
     MAX_CHUNKS_PER_DEPT: int = 5
+    RAG_PERSIST_INDEX: bool = True  # Save the FAISS index and chunk embeddings under DATA_DIR/rag_cache
+    EXPLANATION_CACHE_SIZE: int = 2000  # Explanations kept in memory (0 disables the cache)
+    EXPLANATION_CACHE_TTL: int = 24 * 60 * 60  # Seconds before a cached explanation is regenerated
+    EXPLANATION_CACHE_TRAIT_GRID: float = 0.1  # Trait score resolution in explanation cache keys
+    EXPLANATION_CACHE_QUESTIONS_BUCKET: int = 3  # Answer counts sharing an LLM explanation
+    EXPLANATION_CACHE_FILE: Optional[str] = None  # SQLite file that keeps explanations across restarts, e.g. app/data/explanations.db
     
     # Optional external API keys
     HF_TOKEN: Optional[str] = None
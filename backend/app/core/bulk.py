@@ -0,0 +1,288 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator,
+    List, NamedTuple, Optional, Tuple
+)
+
+if TYPE_CHECKING:
+    from .classifier import TaqneeqClassifier
+
+logger = logging.getLogger(__name__)
+
+SHEET_FORMATS = ("jsonl", "csv")
+
+
+class AnswerSheet(NamedTuple):
+    """One exported answer vector: a row id and its answers in order"""
+    row_id: str
+    answers: List[Tuple[str, int, float]]
+    error: Optional[str] = None
+
+
+class AnswerSheetParser:
+    """
+    Turns JSONL or CSV lines into answer sheets
+
+    JSONL rows look like ``{"id": "r1", "answers": {"question_id": 4, ...}}``
+    or give ``answers`` as a list of ``{"question_id", "response",
+    "confidence"}`` objects, one row per line. CSV files have a header row
+    naming an optional ``id`` column plus one column per question id; blank
+    cells are unanswered, quoted cells may span lines, and columns that
+    are not question ids (e.g. a form export's Timestamp or Email Address)
+    are skipped and logged once. Answers are applied in the order they
+    appear.
+    """
+
+    def __init__(self, fmt: str, question_ids: Iterable[str]):
+        if fmt not in SHEET_FORMATS:
+            raise ValueError(f"Unknown answer sheet format: {fmt}")
+        self.fmt = fmt
+        self.question_ids = set(question_ids)
+        self.line_number = 0
+        self.columns: Optional[List[str]] = None
+        self.ignored_columns: List[str] = []
+        self._pending: List[str] = []  # Lines of a CSV record whose quoted cell is still open
+
+    def parse(self, line: str) -> Optional[AnswerSheet]:
+        """Parse one line; returns None for blank lines, the CSV header and unfinished CSV records"""
+        self.line_number += 1
+        line = line.rstrip("\r\n")
+        if self.line_number == 1:
+            line = line.lstrip("\ufeff")
+        if self.fmt == "jsonl":
+            if not line.strip():
+                return None
+            return self._parse_jsonl(line)
+
+        if not self._pending and not line.strip():
+            return None
+        self._pending.append(line)
+        if sum(pending.count('"') for pending in self._pending) % 2:
+            return None  # A quoted cell continues on the next line
+        return self._pending_record()
+
+    def close(self) -> Optional[AnswerSheet]:
+        """Sheet for a CSV record still open at the end of input (an unterminated quote), if any"""
+        return self._pending_record() if self._pending else None
+
+    def _pending_record(self) -> Optional[AnswerSheet]:
+        lines, self._pending = self._pending, []
+        return self._csv_record(next(csv.reader(lines)), self.line_number - len(lines) + 1)
+
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[AnswerSheet]:
+        if self.fmt == "jsonl":
+            for line in lines:
+                sheet = self.parse(line)
+                if sheet is not None:
+                    yield sheet
+            return
+
+        reader = csv.reader(self._strip_bom(lines))
+        while True:
+            first_line = reader.line_num + 1
+            try:
+                cells = next(reader)
+            except StopIteration:
+                break
+            self.line_number = reader.line_num
+            if any(cell.strip() for cell in cells):
+                sheet = self._csv_record(cells, first_line)
+                if sheet is not None:
+                    yield sheet
+
+    def _strip_bom(self, lines: Iterable[str]) -> Iterator[str]:
+        iterator = iter(lines)
+        first = next(iterator, None)
+        if first is not None:
+            yield first.lstrip("\ufeff")
+            yield from iterator
+
+    def _parse_jsonl(self, line: str) -> AnswerSheet:
+        row_id = str(self.line_number)
+        try:
+            record = json.loads(line)
+            row_id = str(record.get("id", row_id))
+            answers = record["answers"]
+            if isinstance(answers, dict):
+                parsed = [(str(qid), int(response), 1.0) for qid, response in answers.items()]
+            else:
+                parsed = [
+                    (str(answer["question_id"]), int(answer["response"]),
+                     float(answer.get("confidence", 1.0)))
+                    for answer in answers
+                ]
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            return AnswerSheet(row_id, [], f"Invalid row: {e!r}")
+        return AnswerSheet(row_id, parsed)
+
+    def _csv_record(self, cells: List[str], line_number: int) -> Optional[AnswerSheet]:
+        """Answer sheet for one CSV record starting on ``line_number`` (None for the header)"""
+        if self.columns is None:
+            self.columns = [cell.strip() for cell in cells]
+            self.ignored_columns = [
+                column for column in self.columns
+                if column != "id" and column not in self.question_ids
+            ]
+            if self.ignored_columns:
+                logger.warning("Ignoring CSV columns that are not question ids: %s",
+                               ", ".join(self.ignored_columns))
+            return None
+
+        row_id = str(line_number)
+        answers = []
+        for column, value in zip(self.columns, cells):
+            if column == "id":
+                row_id = value.strip() or row_id
+            elif column in self.question_ids and value.strip():
+                answers.append((column, value))
+        try:
+            parsed = [(question_id, int(value), 1.0) for question_id, value in answers]
+        except ValueError as e:
+            return AnswerSheet(row_id, [], f"Invalid row: {e}")
+        return AnswerSheet(row_id, parsed)
+
+
+def classify_sheets(classifier: "TaqneeqClassifier", sheets: List[AnswerSheet]) -> List[Dict[str, Any]]:
+    """Score a chunk of sheets; invalid rows come back with an ``error`` field"""
+    rows = []
+    for sheet in sheets:
+        row: Dict[str, Any] = {"id": sheet.row_id}
+        if sheet.error:
+            row["error"] = sheet.error
+        else:
+            try:
+                row.update(classifier.classify_answer_sheet(sheet.answers))
+            except ValueError as e:
+                row["error"] = str(e)
+        rows.append(row)
+    return rows
+
+
+# Classifier used inside pool workers. Forked workers inherit the parent's
+# instance; spawned ones load their own in _init_worker.
+_worker_classifier: Optional["TaqneeqClassifier"] = None
+
+
+def _init_worker():
+    global _worker_classifier
+    if _worker_classifier is None:
+        from .classifier import TaqneeqClassifier
+        _worker_classifier = TaqneeqClassifier()
+
+
+def _classify_chunk(sheets: List[AnswerSheet]) -> List[Dict[str, Any]]:
+    return classify_sheets(_worker_classifier, sheets)
+
+
+def _chunked(sheets: Iterable[AnswerSheet], size: int) -> Iterator[List[AnswerSheet]]:
+    iterator = iter(sheets)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BulkClassifier:
+    """
+    Offline scoring of answer sheets fanned out over a process pool
+
+    Sheets are read lazily in chunks of ``chunk_size`` and at most two
+    chunks per worker are in flight, so memory stays bounded however large
+    the input is. Results come back in input order. With one worker (or
+    one CPU) everything runs in-process.
+    """
+
+    def __init__(self, classifier: "TaqneeqClassifier", workers: int = 0, chunk_size: int = 256):
+        self.classifier = classifier
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.max_in_flight = 2 * self.workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 1:
+            return None
+        with self._lock:
+            if self._pool is None:
+                global _worker_classifier
+                _worker_classifier = self.classifier
+                self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker)
+                logger.info(f"Started bulk classification pool with {self.workers} workers")
+            return self._pool
+
+    def classify(self, sheets: Iterable[AnswerSheet]) -> Iterator[Dict[str, Any]]:
+        """Yield one result row per sheet, in input order"""
+        pool = self._get_pool()
+        if pool is None:
+            for chunk in _chunked(sheets, self.chunk_size):
+                yield from classify_sheets(self.classifier, chunk)
+            return
+
+        pending = deque()
+        for chunk in _chunked(sheets, self.chunk_size):
+            pending.append(pool.submit(_classify_chunk, chunk))
+            if len(pending) >= self.max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    async def classify_stream(self, lines: AsyncIterable[str], fmt: str) -> AsyncIterator[Dict[str, Any]]:
+        """Async variant of classify() over incoming lines, for streaming requests"""
+        parser = AnswerSheetParser(fmt, self.classifier.questions)
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+
+        def submit(chunk: List[AnswerSheet]) -> "asyncio.Future":
+            if pool is None:
+                return loop.run_in_executor(None, classify_sheets, self.classifier, chunk)
+            return asyncio.wrap_future(pool.submit(_classify_chunk, chunk))
+
+        pending = deque()
+        chunk: List[AnswerSheet] = []
+        async for line in lines:
+            sheet = parser.parse(line)
+            if sheet is None:
+                continue
+            chunk.append(sheet)
+            if len(chunk) >= self.chunk_size:
+                pending.append(submit(chunk))
+                chunk = []
+                if len(pending) >= self.max_in_flight:
+                    for row in await pending.popleft():
+                        yield row
+        sheet = parser.close()
+        if sheet is not None:
+            chunk.append(sheet)
+        if chunk:
+            pending.append(submit(chunk))
+        while pending:
+            for row in await pending.popleft():
+                yield row
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream (e.g. a request body) into decoded lines"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if buffer:
+        yield buffer.decode("utf-8")
@@ -1,20 +1,39 @@
+import hashlib
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
 
 from .models import (
-    Department, Question, Session, SessionState, UserResponse,
+    Department, Question, Session, SessionLayout, SessionState,
     ClassificationResult
 )
 from .utils import (
-    cosine_similarity, softmax, calculate_entropy,
-    calculate_information_gain, normalize_likert_response, get_confidence_level,
+    softmax_array, entropy_array,
+    normalize_likert_response, get_confidence_level,
     TRAIT_NAMES
 )
+from .decision_tree import DecisionTree, compile_decision_tree
+from .department_search import DepartmentSearchIndex
+from .decision_cache import CachedDecision, DecisionCache
+from .session_store import BaseSessionStore, create_session_store
+from .usage_stats import BaseUsageStats, create_usage_stats
 from ..config import settings
 
 logger = logging.getLogger(__name__)
+# Per-answer next-question reasoning (DEBUG); sample it with LOG_SAMPLE_RATES
+decision_logger = logging.getLogger(f"{__name__}.decisions")
+
+
+class QuestionOperator(NamedTuple):
+    """Precompiled trait update for a single question"""
+    row: int                        # Row in the classifier's question matrices
+    trait_indices: np.ndarray       # Primary trait first, then known secondary traits
+    strengths: np.ndarray           # Relative update strength per index (1.0 primary, 0.5 secondary)
+    response_targets: np.ndarray    # Normalized target score for responses 1..5
 
 
 class TaqneeqClassifier:
@@ -24,13 +43,48 @@ class TaqneeqClassifier:
 
     def __init__(self):
         self.departments: Dict[str, Department] = {}
+        self.departments_hash: str = ""  # sha256 of the loaded departments file
         self.questions: Dict[str, Question] = {}
         self.seed_questions: List[Question] = []
-        self.sessions: Dict[str, Session] = {}
+
+        # Scoring matrices (built from departments at load time)
+        self.trait_index: Dict[str, int] = {trait: i for i, trait in enumerate(TRAIT_NAMES)}
+        self.department_ids: List[str] = []
+        self.department_index: Dict[str, int] = {}
+        self.department_matrix: np.ndarray = np.zeros((0, len(TRAIT_NAMES)))
+        self.department_norms: np.ndarray = np.zeros(0)
+        self.department_similarity: np.ndarray = np.zeros((0, 0))
+        self.department_neighbors: Dict[str, List[Tuple[str, float]]] = {}
+
+        # Text index for department search (built when departments load)
+        self.department_search = DepartmentSearchIndex([])
+
+        # Question update operators (compiled from the question bank at load time)
+        self.question_operators: Dict[str, QuestionOperator] = {}
+        self.question_strengths: np.ndarray = np.zeros((0, len(TRAIT_NAMES)))
+        self.question_targets: np.ndarray = np.zeros((0, 5))
+
+        # Per-row question metadata used by adaptive selection
+        self.question_by_row: List[Question] = []
+        self.question_primary: np.ndarray = np.zeros(0, dtype=np.intp)
+        self.question_information_value: np.ndarray = np.zeros(0)
+        self.question_department_targets: np.ndarray = np.zeros((0, 0), dtype=bool)
+        self.adaptive_mask: np.ndarray = np.zeros(0, dtype=bool)
+        self.session_layout = SessionLayout(department_ids=(), question_ids=())
+
+        # Precompiled full-confidence decisions for the first answers
+        self.decision_tree: Optional[DecisionTree] = None
+
+        # Cross-session memo of live decisions (created after the tree is compiled)
+        self.decision_cache: Optional[DecisionCache] = None
 
         # Load data on initialization
         self._load_data()
 
+        # Session backend (needs the loaded question/department layout)
+        self.sessions: BaseSessionStore = create_session_store(self.session_layout)
+        self.usage_stats: BaseUsageStats = create_usage_stats(self.sessions)
+
         logger.info(
             f"TaqneeqClassifier initialized: {len(self.departments)} departments, "
             f"{len(self.questions)} questions, {len(self.seed_questions)} seed questions"
@@ -40,8 +94,10 @@ class TaqneeqClassifier:
         """Load departments and questions from JSON files"""
         try:
             # Load departments
-            with open(settings.DEPARTMENTS_FILE, 'r', encoding='utf-8') as f:
-                dept_data = json.load(f)
+            with open(settings.DEPARTMENTS_FILE, 'rb') as f:
+                dept_bytes = f.read()
+                self.departments_hash = hashlib.sha256(dept_bytes).hexdigest()
+                dept_data = json.loads(dept_bytes.decode('utf-8'))
                 for dept in dept_data['departments']:
                     department = Department(**dept)
                     self.departments[department.id] = department
@@ -65,27 +121,152 @@ class TaqneeqClassifier:
                     self.seed_questions.append(question)
                     self.questions[question.id] = question
 
+            self._build_scoring_matrices()
+            self.department_search = DepartmentSearchIndex(self.departments.values())
+            self._compile_question_operators()
+            self.decision_tree = None  # Compile against live computation, not stale decisions
+            self.decision_cache = None
+            self.decision_tree = compile_decision_tree(self, settings.DECISION_TREE_DEPTH)
+            if settings.DECISION_CACHE_SIZE > 0:
+                self.decision_cache = DecisionCache(
+                    settings.DECISION_CACHE_SIZE, settings.DECISION_CACHE_QUANTUM
+                )
+
         except Exception as e:
             logger.error(f"Failed to load data: {e}")
             raise RuntimeError(f"Data loading failed: {e}")
 
-    def start_session(self) -> Tuple[str, Question]:
-        """Start new classification session"""
-        session = Session()
-
-        # Initialize uniform department probabilities
-        num_depts = len(self.departments)
-        session.department_probabilities = {
-            dept_id: 1.0 / num_depts for dept_id in self.departments.keys()
+    def _build_scoring_matrices(self):
+        """Build the department x trait weight matrix in TRAIT_NAMES order"""
+        self.department_ids = list(self.departments.keys())
+        self.department_index = {dept_id: i for i, dept_id in enumerate(self.department_ids)}
+        self.department_matrix = np.array(
+            [
+                [dept.trait_weights.get(trait, 0.0) for trait in TRAIT_NAMES]
+                for dept in self.departments.values()
+            ],
+            dtype=float
+        ).reshape(len(self.department_ids), len(TRAIT_NAMES))
+        self.department_norms = np.linalg.norm(self.department_matrix, axis=1)
+
+        # Pairwise cosine similarity and every department's neighbors, most similar first
+        with np.errstate(divide='ignore', invalid='ignore'):
+            unit_rows = np.where(
+                self.department_norms[:, None] > 0,
+                self.department_matrix / self.department_norms[:, None],
+                0.0
+            )
+        self.department_similarity = np.clip(unit_rows @ unit_rows.T, 0.0, 1.0)
+        self.department_neighbors = {}
+        for i, dept_id in enumerate(self.department_ids):
+            order = np.argsort(-self.department_similarity[i], kind="stable")
+            self.department_neighbors[dept_id] = [
+                (self.department_ids[j], float(self.department_similarity[i, j]))
+                for j in order if j != i
+            ]
+
+    def _scoring_content_hash(self) -> str:
+        """Hash of the loaded question and department data (canonical JSON, seed order included)"""
+        content = {
+            "departments": [dept.model_dump(mode="json") for dept in self.departments.values()],
+            "questions": [question.model_dump(mode="json") for question in self.questions.values()],
+            "seed_questions": [question.id for question in self.seed_questions]
         }
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()
+
+    def _compile_question_operators(self):
+        """Compile every question into a fixed trait update operator"""
+        num_traits = len(TRAIT_NAMES)
+        full_strength = settings.LEARNING_RATE
+
+        self.question_operators = {}
+        self.question_strengths = np.zeros((len(self.questions), num_traits))
+        self.question_targets = np.zeros((len(self.questions), 5))
+
+        self.question_by_row = list(self.questions.values())
+        self.question_primary = np.array(
+            [self.trait_index[q.primary_trait] for q in self.question_by_row], dtype=np.intp
+        )
+        self.question_information_value = np.array(
+            [q.information_value for q in self.question_by_row], dtype=float
+        )
+        self.question_department_targets = np.array(
+            [[dept_id in q.target_departments for dept_id in self.department_ids]
+             for q in self.question_by_row],
+            dtype=bool
+        ).reshape(len(self.question_by_row), len(self.department_ids))
+        self.adaptive_mask = np.array(
+            [q.question_stage == "adaptive" for q in self.question_by_row], dtype=bool
+        )
+        self.session_layout = SessionLayout(
+            department_ids=tuple(self.department_ids),
+            question_ids=tuple(q.id for q in self.question_by_row),
+            content_hash=self._scoring_content_hash()
+        )
 
-        # Initialize neutral trait scores
-        session.trait_scores = {trait: 0.5 for trait in TRAIT_NAMES}
-
+        for row, question in enumerate(self.question_by_row):
+            # Each trait is updated once; the primary impact wins over a repeated secondary
+            impacts = {self.trait_index[question.primary_trait]: 1.0}
+            for trait in question.secondary_traits:
+                if trait in self.trait_index:
+                    impacts.setdefault(self.trait_index[trait], 0.5)
+            operator = QuestionOperator(
+                row=row,
+                trait_indices=np.array(list(impacts.keys()), dtype=np.intp),
+                strengths=np.array(list(impacts.values())),
+                response_targets=np.array([
+                    normalize_likert_response(response) for response in (1, 2, 3, 4, 5)
+                ])
+            )
+            self.question_operators[question.id] = operator
+
+            # Full-confidence update strengths, used by the what-if simulation
+            self.question_strengths[row, operator.trait_indices] = operator.strengths * full_strength
+            self.question_targets[row] = operator.response_targets
+
+    def _apply_operator(self, trait_scores: np.ndarray, operator: QuestionOperator,
+                        response: int, confidence: float) -> np.ndarray:
+        """Apply a compiled question update to a trait vector"""
+        strengths = operator.strengths * (confidence * settings.LEARNING_RATE)
+        target = operator.response_targets[response - 1]
+        current = trait_scores[operator.trait_indices]
+
+        updated = trait_scores.copy()
+        updated[operator.trait_indices] = np.clip(
+            current * (1 - strengths) + target * strengths, 0.0, 1.0
+        )
+        return updated
+
+    def _department_similarities(self, trait_vectors: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of trait vector(s) against every department
+
+        Accepts a single trait vector or any stack of them (last axis = traits)
+        and returns similarities clamped to [0, 1] with departments on the last axis.
+        """
+        dots = trait_vectors @ self.department_matrix.T
+        magnitudes = np.linalg.norm(trait_vectors, axis=-1, keepdims=True) * self.department_norms
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarities = np.where(magnitudes > 0, dots / magnitudes, 0.0)
+        return np.clip(similarities, 0.0, 1.0)
+
+    def _new_session(self) -> Session:
+        """Create an initialized session without registering it"""
+        # Neutral traits and uniform department probabilities
+        session = Session(self.session_layout)
         session.state = SessionState.SEED_QUESTIONS
-        self.sessions[session.session_id] = session
+        session.tree_node = 0 if self.decision_tree is not None else -1
+        return session
+
+    def start_session(self) -> Tuple[str, Question]:
+        """Start new classification session"""
+        session = self._new_session()
+        self.sessions.put(session)
+        self.usage_stats.session_started(session)
 
-        logger.info(f"Started session {session.session_id}")
+        logger.info("Started session %s", session.session_id)
 
         if not self.seed_questions:
             raise RuntimeError("No seed questions available")
@@ -97,10 +278,82 @@ class TaqneeqClassifier:
         response: int, confidence: float = 1.0
     ) -> Tuple[Optional[Question], ClassificationResult]:
         """Process user response and determine next step"""
-        session = self.sessions.get(session_id)
-        if not session:
-            raise ValueError(f"Session not found: {session_id}")
+        return self.process_responses(session_id, [(question_id, response, confidence)])
+
+    def process_responses(
+        self, session_id: str, answers: List[Tuple[str, int, float]]
+    ) -> Tuple[Optional[Question], ClassificationResult]:
+        """
+        Apply an ordered batch of (question_id, response, confidence) answers
+
+        Every answer is validated before any is applied. Trait scores are
+        updated answer by answer and the next step is decided once, after
+        the last answer, so the outcome matches submitting them one at a time.
+        """
+        if not answers:
+            raise ValueError("At least one answer is required")
+
+        # Answers for one session are applied one at a time
+        with self.sessions.locked(session_id) as session:
+            if not session:
+                raise ValueError(f"Session not found: {session_id}")
+
+            validated = [
+                (self._validate_answer(question_id, response, confidence), response, confidence)
+                for question_id, response, confidence in answers
+            ]
+            previous_state, previous_department = session.state, session.top_department
+            for question, response, confidence in validated:
+                self._record_response(session, question, response, confidence)
+
+            next_question, should_continue = self._decide_next_step(session)
+            result = self._create_classification_result(session, should_continue)
+
+            if not should_continue:
+                session.state = SessionState.COMPLETE
+                session.completed_at = time.time()
+                logger.info(
+                    "Classification complete for session %s: %s", session_id, result.top_department
+                )
+
+            self.usage_stats.answers_recorded(
+                previous_state, previous_department, session,
+                [response for _, response, _ in validated]
+            )
+
+        return next_question, result
+
+    def classify_answer_sheet(self, answers: List[Tuple[str, int, float]]) -> Dict[str, Any]:
+        """
+        Score a complete, ordered answer vector without creating a session
+
+        Used for offline re-scoring; the probabilities are the ones a live
+        session reaches after the same answers.
+        """
+        if not answers:
+            raise ValueError("At least one answer is required")
+
+        validated = [
+            (self._validate_answer(question_id, response, confidence), response, confidence)
+            for question_id, response, confidence in answers
+        ]
+        session = self._new_session()
+        for question, response, confidence in validated:
+            self._record_response(session, question, response, confidence)
+        probabilities = self._update_department_probabilities(session)
+
+        return {
+            "top_department": session.top_department,
+            "top_probability": round(float(probabilities[session.top_department_index]), 3),
+            "all_probabilities": {
+                dept_id: round(probability, 3)
+                for dept_id, probability in session.department_probabilities.items()
+            },
+            "questions_answered": session.response_count
+        }
 
+    def _validate_answer(self, question_id: str, response: int, confidence: float) -> Question:
+        """Check one answer and return its question"""
         question = self.questions.get(question_id)
         if not question:
             raise ValueError(f"Question not found: {question_id}")
@@ -111,63 +364,94 @@ class TaqneeqClassifier:
         if not 0.0 <= confidence <= 1.0:
             raise ValueError(f"Confidence must be 0.0-1.0, got {confidence}")
 
-        # Store response
-        user_response = UserResponse(
-            question_id=question_id,
-            response=response,
-            confidence=confidence
-        )
-        session.responses.append(user_response)
-        session.questions_asked.append(question_id)
-        session.update_activity()
+        return question
+
+    def _apply_response(self, session: Session, question: Question,
+                        response: int, confidence: float) -> Tuple[Optional[Question], bool]:
+        """Record a validated response, update the session and decide the next step"""
+        self._record_response(session, question, response, confidence)
+        return self._decide_next_step(session)
+
+    def _record_response(self, session: Session, question: Question,
+                         response: int, confidence: float):
+        """Store a validated response and update trait scores"""
+        row = self.question_operators[question.id].row
+        session.record_response(row, response, confidence)
+        session.asked_mask[row] = True
+        session.trait_question_counts[self.question_primary[row]] += 1
+
+        # Full-confidence answers along a precompiled path are a table lookup
+        if self.decision_tree is not None and confidence == 1.0:
+            session.tree_node = self.decision_tree.child(session.tree_node, row, response)
+        else:
+            session.tree_node = -1
+        if session.tree_node >= 0:
+            session.trait_scores = self.decision_tree.trait_scores[session.tree_node].copy()
+        else:
+            self._update_trait_scores(session, question, response, confidence)
+
+    def _decide_next_step(self, session: Session) -> Tuple[Optional[Question], bool]:
+        """Update department probabilities and pick the next question or stop"""
+        if session.tree_node >= 0:
+            tree, node = self.decision_tree, session.tree_node
+            return self._load_decision(
+                session, tree.probabilities[node], tree.top_department[node], tree.next_question[node]
+            )
 
-        # Update traits & probabilities
-        self._update_trait_scores(session, question, response, confidence)
-        self._update_department_probabilities(session)
+        # Sessions in an already-seen state reuse its decision
+        cache_key = None
+        if self.decision_cache is not None:
+            cache_key = self.decision_cache.make_key(session)
+            cached = self.decision_cache.get(cache_key)
+            if cached is not None:
+                return self._load_decision(session, *cached)
 
-        # Next step
+        # Update probabilities & pick next step
+        probabilities = self._update_department_probabilities(session)
         next_question, should_continue = self._get_next_question(session)
-        result = self._create_classification_result(session, should_continue)
 
-        if not should_continue:
-            session.state = SessionState.COMPLETE
-            session.completed_at = datetime.now()
-            logger.info(
-                f"Classification complete for session {session_id}: {result.top_department}"
-            )
+        if cache_key is not None:
+            self.decision_cache.put(cache_key, CachedDecision(
+                probabilities=probabilities,
+                top_department=session.top_department_index,
+                next_question=(
+                    self.question_operators[next_question.id].row
+                    if (next_question is not None and should_continue) else -1
+                )
+            ))
+        return next_question, should_continue
+
+    def _load_decision(self, session: Session, probabilities: np.ndarray,
+                       top_department: int, next_row: int) -> Tuple[Optional[Question], bool]:
+        """Load a precomputed decision (tree node or cache entry) into the session"""
+        session.probabilities = probabilities.copy()
+        session.top_department_index = int(top_department)
+
+        if next_row < 0:
+            return None, False
 
-        return next_question, result
+        if session.response_count < len(self.seed_questions):
+            session.state = SessionState.SEED_QUESTIONS
+        else:
+            session.state = SessionState.ADAPTIVE_QUESTIONS
+        return self.question_by_row[next_row], True
 
     def _update_trait_scores(self, session: Session, question: Question,
                              response: int, confidence: float):
         """Update user trait scores"""
-        normalized_response = normalize_likert_response(response)
-        update_strength = confidence * settings.LEARNING_RATE
-
-        # Primary trait
-        current_score = session.trait_scores[question.primary_trait]
-        new_score = current_score * (1 - update_strength) + normalized_response * update_strength
-        session.trait_scores[question.primary_trait] = max(0.0, min(1.0, new_score))
-
-        # Secondary traits
-        secondary_strength = update_strength * 0.5
-        for trait in question.secondary_traits:
-            if trait in session.trait_scores:
-                current_score = session.trait_scores[trait]
-                new_score = current_score * (1 - secondary_strength) + normalized_response * secondary_strength
-                session.trait_scores[trait] = max(0.0, min(1.0, new_score))
-
-    def _update_department_probabilities(self, session: Session):
+        operator = self.question_operators[question.id]
+        session.trait_scores = self._apply_operator(session.trait_scores, operator, response, confidence)
+
+    def _update_department_probabilities(self, session: Session) -> np.ndarray:
         """Update department probabilities using cosine similarity"""
-        similarities = {
-            dept_id: cosine_similarity(session.trait_scores, dept.trait_weights)
-            for dept_id, dept in self.departments.items()
-        }
-        session.department_probabilities = softmax(similarities)
+        probabilities = softmax_array(self._department_similarities(session.trait_scores))
+        session.probabilities = probabilities
+        session.top_department_index = int(np.argmax(probabilities))
+        return probabilities
 
     def _get_next_question(self, session: Session) -> Tuple[Optional[Question], bool]:
         """Determine next question or if classification should stop"""
-        questions_answered = len(session.responses)
+        questions_answered = session.response_count
 
         # Phase 1: Seed questions
         if questions_answered < len(self.seed_questions):
@@ -175,16 +459,16 @@ class TaqneeqClassifier:
             return self.seed_questions[questions_answered], True
 
         # Probabilities
-        probs = session.department_probabilities
-        top_prob = max(probs.values()) if probs else 0.0
-        sorted_probs = sorted(probs.values(), reverse=True)
-        second_prob = sorted_probs[1] if len(sorted_probs) > 1 else 0.0
+        sorted_probs = np.sort(session.probabilities)[::-1]
+        top_prob = float(sorted_probs[0]) if sorted_probs.size else 0.0
+        second_prob = float(sorted_probs[1]) if sorted_probs.size > 1 else 0.0
         adaptive_questions_asked = questions_answered - len(self.seed_questions)
         gap = top_prob - second_prob
 
-        logger.info(
-            f"Question decision: Q{questions_answered}, Adaptive={adaptive_questions_asked}, "
-            f"Top={top_prob:.1%}, Gap={gap:.1%}, MinAdaptive={settings.MIN_ADAPTIVE_QUESTIONS}"
+        decision_logger.debug(
+            "Question decision: Q%d, Adaptive=%d, Top=%.1f%%, Gap=%.1f%%, MinAdaptive=%d",
+            questions_answered, adaptive_questions_asked, top_prob * 100, gap * 100,
+            settings.MIN_ADAPTIVE_QUESTIONS
         )
 
         # Stop criteria
@@ -198,94 +482,82 @@ class TaqneeqClassifier:
 
         if adaptive_questions_asked < settings.MIN_ADAPTIVE_QUESTIONS:
             should_stop = False
-            logger.info(
-                f"Forcing more questions: {adaptive_questions_asked}/"
-                f"{settings.MIN_ADAPTIVE_QUESTIONS} adaptive questions asked"
+            decision_logger.debug(
+                "Forcing more questions: %d/%d adaptive questions asked",
+                adaptive_questions_asked, settings.MIN_ADAPTIVE_QUESTIONS
             )
         if adaptive_questions_asked < 8:
             should_stop = False
-            logger.info(f"Forcing more questions: {adaptive_questions_asked}/8 adaptive questions asked")
+            decision_logger.debug("Forcing more questions: %d/8 adaptive questions asked", adaptive_questions_asked)
 
         if should_stop:
-            logger.info(
-                f"Classification stopping: questions={questions_answered}, "
-                f"adaptive={adaptive_questions_asked}, top_prob={top_prob:.1%}, gap={gap:.1%}"
+            decision_logger.debug(
+                "Classification stopping: questions=%d, adaptive=%d, top_prob=%.1f%%, gap=%.1f%%",
+                questions_answered, adaptive_questions_asked, top_prob * 100, gap * 100
             )
             return None, False
 
         # Phase 2: Adaptive questions
         session.state = SessionState.ADAPTIVE_QUESTIONS
-        available_questions = [
-            q for q in self.questions.values()
-            if (q.id not in session.questions_asked and q.question_stage == "adaptive")
-        ]
-        if not available_questions:
-            logger.info("No more questions available, stopping classification")
+        selection = self._select_best_question(session)
+        if selection is None:
+            decision_logger.debug("No more questions available, stopping classification")
             return None, False
 
-        # Pick best question
-        best_question, max_gain = None, -1
-        for question in available_questions:
-            info_gain = self._calculate_information_gain(session, question)
+        best_question, max_gain = selection
+        decision_logger.debug(
+            "Selected question %s with gain %.3f, questions_answered=%d",
+            best_question.id, max_gain, questions_answered
+        )
+        return best_question, True
 
-            # Boost uncertain dept
-            top_department = max(probs.items(), key=lambda x: x[1])[0]
-            if top_department in question.target_departments:
-                info_gain *= 1.5
+    def _select_best_question(self, session: Session) -> Optional[Tuple[Question, float]]:
+        """Pick the unasked adaptive question with the highest weighted information gain"""
+        rows = np.flatnonzero(self.adaptive_mask & ~session.asked_mask)
+        if rows.size == 0:
+            return None
 
-            # Boost unexplored traits
-            trait_questions_asked = sum(
-                1 for resp in session.responses
-                if self.questions[resp.question_id].primary_trait == question.primary_trait  # ✅ CORRECT
-            )
-            if trait_questions_asked == 0:
-                info_gain *= 2.0
-            elif trait_questions_asked == 1:
-                info_gain *= 1.3
+        # Score every candidate in one batched pass
+        info_gains = self._batched_information_gain(session, rows)
 
-            weighted_gain = info_gain * question.information_value
-            if weighted_gain > max_gain:
-                max_gain, best_question = weighted_gain, question
+        # Boost uncertain dept
+        top_column = session.top_department_index
+        info_gains *= np.where(self.question_department_targets[rows, top_column], 1.5, 1.0)
 
-        logger.info(
-            f"Selected question {best_question.id} with gain {max_gain:.3f}, "
-            f"questions_answered={questions_answered}"
+        # Boost unexplored traits
+        trait_questions_asked = session.trait_question_counts[self.question_primary[rows]]
+        info_gains *= np.where(
+            trait_questions_asked == 0, 2.0,
+            np.where(trait_questions_asked == 1, 1.3, 1.0)
         )
-        return best_question, True
+
+        weighted_gains = info_gains * self.question_information_value[rows]
+        best_index = int(np.argmax(weighted_gains))
+        return self.question_by_row[rows[best_index]], float(weighted_gains[best_index])
 
     def _calculate_information_gain(self, session: Session, question: Question) -> float:
         """Calculate expected information gain from asking a question"""
-        current_entropy = calculate_entropy(session.department_probabilities)
-        expected_entropy = 0.0
-
-        for response in [1, 2, 3, 4, 5]:
-            temp_scores = session.trait_scores.copy()
-            normalized_response = normalize_likert_response(response)
-            update_strength = settings.LEARNING_RATE
-
-            # Primary trait
-            current = temp_scores[question.primary_trait]
-            temp_scores[question.primary_trait] = (
-                current * (1 - update_strength) + normalized_response * update_strength
-            )
+        row = self.question_operators[question.id].row
+        return float(self._batched_information_gain(session, np.array([row]))[0])
 
-            # Secondary traits
-            for trait in question.secondary_traits:
-                if trait in temp_scores:
-                    current = temp_scores[trait]
-                    temp_scores[trait] = (
-                        current * (1 - update_strength * 0.5) + normalized_response * update_strength * 0.5
-                    )
-
-            # Dept probabilities
-            temp_similarities = {
-                dept_id: cosine_similarity(temp_scores, dept.trait_weights)
-                for dept_id, dept in self.departments.items()
-            }
-            temp_probs = softmax(temp_similarities)
-            expected_entropy += calculate_entropy(temp_probs) / 5.0
+    def _batched_information_gain(self, session: Session, rows: np.ndarray) -> np.ndarray:
+        """
+        Expected information gain for every candidate question at once
 
-        return max(0.0, current_entropy - expected_entropy)
+        Builds a (candidates x 5 responses x traits) tensor of hypothetical
+        trait states, scores it against the department matrix in one pass and
+        returns the entropy reduction per candidate.
+        """
+        # (C, 5, T): new = current * (1 - strength) + target * strength
+        strengths = self.question_strengths[rows][:, None, :]
+        targets = self.question_targets[rows][:, :, None]
+        states = session.trait_scores * (1 - strengths) + targets * strengths
+
+        probabilities = softmax_array(self._department_similarities(states))
+        expected_entropy = entropy_array(probabilities).mean(axis=1)
+        current_entropy = float(entropy_array(session.probabilities))
+
+        return np.maximum(0.0, current_entropy - expected_entropy)
 
     def _create_classification_result(self, session: Session, should_continue: bool) -> ClassificationResult:
         """Create classification result"""
@@ -295,7 +567,7 @@ class TaqneeqClassifier:
         top_dept, top_prob = sorted_depts[0]
         second_dept, second_prob = sorted_depts[1] if len(sorted_depts) > 1 else (None, 0.0)
         confidence_level = get_confidence_level(top_prob)
-        questions_asked = len(session.responses)
+        questions_asked = session.response_count
 
         if not should_continue:
             if top_prob >= settings.CONFIDENCE_THRESHOLD:
@@ -327,30 +599,30 @@ class TaqneeqClassifier:
             reasoning=reasoning
         )
 
+    def get_similar_departments(self, department_id: str, limit: int) -> List[Tuple[str, float]]:
+        """The ``limit`` departments with the most similar trait weights, as (id, similarity)"""
+        return self.department_neighbors.get(department_id, [])[:limit]
+
     def get_session_status(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed session status"""
-        session = self.sessions.get(session_id)
-        if not session:
-            return None
-        return {
-            "session_id": session_id,
-            "state": session.state.value,
-            "progress": session.get_progress_summary(),
-            "created_at": session.created_at.isoformat(),
-            "last_activity": session.last_activity.isoformat()
-        }
+        with self.sessions.locked(session_id) as session:
+            if not session:
+                return None
+            return {
+                "session_id": session_id,
+                "state": session.state.value,
+                "progress": session.get_progress_summary(),
+                "created_at": datetime.fromtimestamp(session.created_at).isoformat(),
+                "last_activity": datetime.fromtimestamp(session.last_activity).isoformat()
+            }
 
-    def cleanup_expired_sessions(self, max_age_hours: int = 24):
-        """Clean up old sessions"""
-        from datetime import timedelta
-        cutoff = datetime.now() - timedelta(hours=max_age_hours)
+    def cleanup_expired_sessions(self, max_age_hours: int = 24) -> int:
+        """Clean up old sessions, returning how many were removed"""
+        cutoff = time.time() - timedelta(hours=max_age_hours).total_seconds()
 
-        expired_sessions = [
-            sid for sid, session in self.sessions.items()
-            if session.last_activity < cutoff
-        ]
-        for sid in expired_sessions:
-            del self.sessions[sid]
+        expired_sessions = self.sessions.remove_inactive(cutoff)
+        self.usage_stats.sessions_expired(expired_sessions)
 
         if expired_sessions:
-            logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
+            logger.info("Cleaned up %d expired sessions", len(expired_sessions))
+        return len(expired_sessions)
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from .models import Session
+
+
+class CachedDecision(NamedTuple):
+    """Outcome of a next-question decision for one session state"""
+    probabilities: np.ndarray   # Department probabilities in department_ids order
+    top_department: int         # Index into department_ids
+    next_question: int          # Question row, or -1 to stop
+
+
+class DecisionCache:
+    """
+    Bounded, thread-safe LRU transposition table of next-question decisions
+
+    Sessions that reach the same (quantized) trait vector with the same
+    asked questions get the same decision, so it is computed once and
+    shared across sessions.
+    """
+
+    def __init__(self, max_size: int, quantum: float = 1e-6):
+        self.max_size = max_size
+        self.quantum = quantum
+        self._entries: "OrderedDict[bytes, CachedDecision]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def make_key(self, session: Session) -> bytes:
+        """Key a session by quantized traits, asked questions and answer counts"""
+        quantized = np.round(session.trait_scores / self.quantum).astype(np.int32)
+        return b"".join((
+            quantized.tobytes(),
+            np.packbits(session.asked_mask).tobytes(),
+            session.trait_question_counts.tobytes(),
+            session.response_count.to_bytes(4, "little")
+        ))
+
+    def get(self, key: bytes) -> Optional[CachedDecision]:
+        """Look up a decision, refreshing its recency on a hit"""
+        with self._lock:
+            decision = self._entries.get(key)
+            if decision is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decision
+
+    def put(self, key: bytes, decision: CachedDecision):
+        """Store a decision, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = decision
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
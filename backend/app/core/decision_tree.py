@@ -0,0 +1,115 @@
+import logging
+import time
+from typing import List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .models import Session
+
+if TYPE_CHECKING:
+    from .classifier import TaqneeqClassifier
+
+logger = logging.getLogger(__name__)
+
+NUM_RESPONSES = 5
+
+
+class DecisionTree:
+    """
+    Array-encoded table of classifier decisions along full-confidence paths
+
+    Node 0 is a freshly started session; node ``i`` has up to five children
+    (one per Likert response) stored contiguously from ``child_base[i]``.
+    Every node holds the trait scores, department probabilities, top
+    department and next question the live classifier would produce after
+    that answer sequence. A ``next_question`` of -1 is a stop decision.
+    """
+
+    def __init__(self, depth: int, trait_scores: np.ndarray, probabilities: np.ndarray,
+                 top_department: np.ndarray, next_question: np.ndarray, child_base: np.ndarray):
+        self.depth = depth
+        self.trait_scores = trait_scores
+        self.probabilities = probabilities
+        self.top_department = top_department
+        self.next_question = next_question
+        self.child_base = child_base
+
+    def __len__(self) -> int:
+        return len(self.next_question)
+
+    def child(self, node: int, question_row: int, response: int) -> int:
+        """Node reached by answering ``question_row`` at ``node``, or -1 if off the tree"""
+        if node < 0 or node >= len(self) or self.child_base[node] < 0 or self.next_question[node] != question_row:
+            return -1
+        return int(self.child_base[node] + response - 1)
+
+    @classmethod
+    def compile(cls, classifier: "TaqneeqClassifier", depth: int) -> "DecisionTree":
+        """Walk the classifier over every full-confidence answer path down to ``depth`` answers"""
+        started = time.perf_counter()
+
+        trait_scores: List[np.ndarray] = []
+        probabilities: List[np.ndarray] = []
+        top_department: List[int] = []
+        next_question: List[int] = []
+        child_base: List[int] = []
+
+        def add_node(session: Session, question_row: int) -> int:
+            trait_scores.append(session.trait_scores.copy())
+            probabilities.append(session.probabilities.copy())
+            top_department.append(session.top_department_index)
+            next_question.append(question_row)
+            child_base.append(-1)
+            return len(next_question) - 1
+
+        # The walk repeats the per-decision log lines thousands of times
+        classifier_logger = logging.getLogger(f"{classifier.__module__}.decisions")
+        was_disabled = classifier_logger.disabled
+        classifier_logger.disabled = True
+        try:
+            root = classifier._new_session()
+            first_row = classifier.question_operators[classifier.seed_questions[0].id].row
+            frontier = [(add_node(root, first_row), root)]
+
+            for _ in range(depth):
+                next_frontier = []
+                for node, session in frontier:
+                    row = next_question[node]
+                    if row < 0:
+                        continue
+                    question = classifier.question_by_row[row]
+                    child_base[node] = len(next_question)
+                    for response in range(1, NUM_RESPONSES + 1):
+                        child = session.copy()
+                        following, should_continue = classifier._apply_response(
+                            child, question, response, 1.0
+                        )
+                        following_row = (
+                            classifier.question_operators[following.id].row
+                            if (following is not None and should_continue) else -1
+                        )
+                        next_frontier.append((add_node(child, following_row), child))
+                frontier = next_frontier
+        finally:
+            classifier_logger.disabled = was_disabled
+
+        tree = cls(
+            depth=depth,
+            trait_scores=np.array(trait_scores),
+            probabilities=np.array(probabilities),
+            top_department=np.array(top_department, dtype=np.intp),
+            next_question=np.array(next_question, dtype=np.intp),
+            child_base=np.array(child_base, dtype=np.intp)
+        )
+        logger.info(
+            f"Decision tree compiled: depth={depth}, nodes={len(tree)}, "
+            f"took {time.perf_counter() - started:.2f}s"
+        )
+        return tree
+
+
+def compile_decision_tree(classifier: "TaqneeqClassifier", depth: int) -> Optional[DecisionTree]:
+    """Compile a decision tree for the classifier, or None when disabled"""
+    if depth <= 0 or not classifier.seed_questions:
+        return None
+    return DecisionTree.compile(classifier, depth)
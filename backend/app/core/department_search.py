@@ -0,0 +1,103 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .models import Department
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+NGRAM_SIZE = 3
+
+# Searchable fields and how much a term found in each counts towards the rank;
+# a name match outranks any amount of body text
+FIELD_WEIGHTS = (
+    ("name", 10.0),
+    ("description", 2.0),
+    ("core_responsibilities", 1.5),
+    ("skills_required", 1.0),
+    ("soft_skills_required", 1.0),
+    ("skills_perks_gained", 1.0),
+    ("example_tasks", 1.0),
+)
+
+# How well an index term matches a query token
+EXACT_MATCH, PREFIX_MATCH, INFIX_MATCH = 1.0, 0.7, 0.4
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _ngrams(term: str) -> Set[str]:
+    return {term[i:i + NGRAM_SIZE] for i in range(len(term) - NGRAM_SIZE + 1)}
+
+
+class DepartmentSearchIndex:
+    """
+    Inverted index over department text for ranked search
+
+    Every token of the searchable fields is posted with a per-department
+    weight (the sum of the weights of the fields it appears in). A query
+    token matches every index term containing it; those terms are found
+    through a trigram index over the vocabulary, so a search never scans
+    department text. All query tokens must match for a department to be
+    returned.
+    """
+
+    def __init__(self, departments: Iterable[Department]):
+        self.department_ids: List[str] = []
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.term_ngrams: Dict[str, Set[str]] = defaultdict(set)
+
+        for position, department in enumerate(departments):
+            self.department_ids.append(department.id)
+            for field, weight in FIELD_WEIGHTS:
+                value = getattr(department, field)
+                texts = value if isinstance(value, list) else [value]
+                for term in {token for text in texts for token in tokenize(text)}:
+                    postings = self.postings.setdefault(term, {})
+                    postings[position] = postings.get(position, 0.0) + weight
+
+        for term in self.postings:
+            for gram in _ngrams(term):
+                self.term_ngrams[gram].add(term)
+
+    def _matching_terms(self, token: str) -> List[Tuple[str, float]]:
+        """Index terms containing ``token``, with their match quality (plurals count as exact)"""
+        if len(token) >= NGRAM_SIZE:
+            gram_terms = sorted((self.term_ngrams.get(gram, set()) for gram in _ngrams(token)), key=len)
+            candidates = set(gram_terms[0]).intersection(*gram_terms[1:])
+        else:
+            candidates = self.postings.keys()
+
+        matches = []
+        for term in candidates:
+            if term == token or term in (token + "s", token + "es"):
+                matches.append((term, EXACT_MATCH))
+            elif term.startswith(token):
+                matches.append((term, PREFIX_MATCH))
+            elif token in term:
+                matches.append((term, INFIX_MATCH))
+        return matches
+
+    def search(self, query: str) -> List[str]:
+        """Department ids matching every token of ``query``, best match first"""
+        scores: Dict[int, float] = {}
+        for i, token in enumerate(dict.fromkeys(tokenize(query))):
+            token_scores: Dict[int, float] = {}
+            for term, quality in self._matching_terms(token):
+                for position, weight in self.postings[term].items():
+                    token_scores[position] = max(token_scores.get(position, 0.0), weight * quality)
+
+            if i == 0:
+                scores = token_scores
+            else:
+                scores = {
+                    position: score + token_scores[position]
+                    for position, score in scores.items() if position in token_scores
+                }
+            if not scores:
+                break
+
+        ranked = sorted(scores, key=lambda position: (-scores[position], position))
+        return [self.department_ids[position] for position in ranked]
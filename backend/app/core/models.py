@@ -1,9 +1,16 @@
+import math
+import struct
+import time
+from array import array
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 from pydantic import BaseModel, Field
+import numpy as np
 import uuid
 
+from .utils import TRAIT_NAMES
+
 class SessionState(str, Enum):
     """Session states for tracking classification progress"""
     INITIALIZED = "initialized"
@@ -69,30 +76,198 @@ class UserResponse(BaseModel):
     confidence: float = Field(1.0, ge=0.0, le=1.0, description="User confidence")
     timestamp: datetime = Field(default_factory=datetime.now)
 
-class Session(BaseModel):
-    """User session with complete state"""
-    session_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    state: SessionState = SessionState.INITIALIZED
-    trait_scores: Dict[str, float] = Field(default_factory=dict)
-    department_probabilities: Dict[str, float] = Field(default_factory=dict)
-    responses: List[UserResponse] = []
-    questions_asked: List[str] = []
-    created_at: datetime = Field(default_factory=datetime.now)
-    completed_at: Optional[datetime] = None
-    last_activity: datetime = Field(default_factory=datetime.now)
+class SessionLayout:
+    """
+    Row orders shared by every session created from one classifier load,
+    plus a hash of the question and department data scores were built from
+    """
+    __slots__ = ("department_ids", "question_ids", "content_hash")
+    
+    def __init__(self, department_ids: Tuple[str, ...], question_ids: Tuple[str, ...], content_hash: str = ""):
+        self.department_ids = department_ids
+        self.question_ids = question_ids
+        self.content_hash = content_hash
+
+_SESSION_STATES = list(SessionState)
+_SESSION_HEADER = struct.Struct("<BBhiIddd")
+_SESSION_BLOB_VERSION = 1
+
+class Session:
+    """
+    Compact per-user session record
+    
+    Scores are fixed-width arrays in TRAIT_NAMES / department order, the
+    response log is int-coded against the layout's question rows and
+    timestamps are epoch seconds. Dict and pydantic views are built on
+    demand for the API.
+    """
+    __slots__ = (
+        "session_id", "state", "layout",
+        "trait_scores", "probabilities", "top_department_index",
+        "asked_mask", "trait_question_counts", "tree_node",
+        "response_rows", "response_values", "response_confidences", "response_times",
+        "created_at", "completed_at", "last_activity"
+    )
+    
+    def __init__(self, layout: SessionLayout, session_id: Optional[str] = None):
+        num_departments = len(layout.department_ids)
+        now = time.time()
+        
+        self.session_id = session_id or str(uuid.uuid4())
+        self.state = SessionState.INITIALIZED
+        self.layout = layout
+        
+        # Neutral traits, uniform department probabilities
+        self.trait_scores = np.full(len(TRAIT_NAMES), 0.5)
+        self.probabilities = np.full(num_departments, 1.0 / num_departments) if num_departments else np.zeros(0)
+        self.top_department_index = 0
+        
+        # Incremental bookkeeping for adaptive selection (maintained by the classifier)
+        self.asked_mask = np.zeros(len(layout.question_ids), dtype=bool)
+        self.trait_question_counts = np.zeros(len(TRAIT_NAMES), dtype=np.int32)
+        self.tree_node = -1  # Position in the classifier's decision tree (-1 = off the tree)
+        
+        # Response log
+        self.response_rows = array('H')
+        self.response_values = array('B')
+        self.response_confidences = array('f')
+        self.response_times = array('d')
+        
+        self.created_at = now
+        self.completed_at: Optional[float] = None
+        self.last_activity = now
+    
+    def copy(self) -> "Session":
+        """Independent copy of this session (same session_id)"""
+        clone = Session.__new__(Session)
+        for slot in Session.__slots__:
+            value = getattr(self, slot)
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            elif isinstance(value, array):
+                value = value[:]
+            setattr(clone, slot, value)
+        return clone
+    
+    def to_bytes(self) -> bytes:
+        """Encode everything but the session_id into a compact binary blob"""
+        completed_at = self.completed_at if self.completed_at is not None else math.nan
+        return b"".join((
+            _SESSION_HEADER.pack(
+                _SESSION_BLOB_VERSION, _SESSION_STATES.index(self.state),
+                self.top_department_index, self.tree_node, len(self.response_rows),
+                self.created_at, completed_at, self.last_activity
+            ),
+            self.trait_scores.astype(np.float64).tobytes(),
+            self.probabilities.astype(np.float64).tobytes(),
+            np.packbits(self.asked_mask).tobytes(),
+            self.trait_question_counts.astype(np.int32).tobytes(),
+            self.response_rows.tobytes(),
+            self.response_values.tobytes(),
+            self.response_confidences.tobytes(),
+            self.response_times.tobytes()
+        ))
+    
+    @classmethod
+    def from_bytes(cls, layout: SessionLayout, session_id: str, blob: bytes) -> "Session":
+        """Decode a blob written by to_bytes() for the same layout"""
+        (version, state, top_index, tree_node, num_responses,
+         created_at, completed_at, last_activity) = _SESSION_HEADER.unpack_from(blob)
+        if version != _SESSION_BLOB_VERSION:
+            raise ValueError(f"Unsupported session blob version: {version}")
+        
+        session = cls.__new__(cls)
+        session.session_id = session_id
+        session.state = _SESSION_STATES[state]
+        session.layout = layout
+        session.top_department_index = top_index
+        session.tree_node = tree_node
+        session.created_at = created_at
+        session.completed_at = None if math.isnan(completed_at) else completed_at
+        session.last_activity = last_activity
+        
+        offset = _SESSION_HEADER.size
+        
+        def take(dtype, count: int) -> np.ndarray:
+            nonlocal offset
+            values = np.frombuffer(blob, dtype=dtype, count=count, offset=offset).copy()
+            offset += values.nbytes
+            return values
+        
+        num_traits = len(TRAIT_NAMES)
+        num_questions = len(layout.question_ids)
+        session.trait_scores = take(np.float64, num_traits)
+        session.probabilities = take(np.float64, len(layout.department_ids))
+        session.asked_mask = np.unpackbits(
+            take(np.uint8, (num_questions + 7) // 8), count=num_questions
+        ).astype(bool)
+        session.trait_question_counts = take(np.int32, num_traits)
+        
+        session.response_rows = array('H', take(np.uint16, num_responses).tobytes())
+        session.response_values = array('B', take(np.uint8, num_responses).tobytes())
+        session.response_confidences = array('f', take(np.float32, num_responses).tobytes())
+        session.response_times = array('d', take(np.float64, num_responses).tobytes())
+        return session
+    
+    def record_response(self, question_row: int, response: int, confidence: float):
+        """Append a response to the log"""
+        self.response_rows.append(question_row)
+        self.response_values.append(response)
+        self.response_confidences.append(confidence)
+        self.response_times.append(time.time())
+        self.update_activity()
+    
+    @property
+    def response_count(self) -> int:
+        return len(self.response_rows)
+    
+    @property
+    def top_department(self) -> Optional[str]:
+        if not self.layout.department_ids:
+            return None
+        return self.layout.department_ids[self.top_department_index]
+    
+    @property
+    def department_probabilities(self) -> Dict[str, float]:
+        return dict(zip(self.layout.department_ids, self.probabilities.tolist()))
+    
+    @property
+    def questions_asked(self) -> List[str]:
+        question_ids = self.layout.question_ids
+        return [question_ids[row] for row in self.response_rows]
+    
+    @property
+    def responses(self) -> List[UserResponse]:
+        question_ids = self.layout.question_ids
+        return [
+            UserResponse(
+                question_id=question_ids[row],
+                response=response,
+                confidence=confidence,
+                timestamp=datetime.fromtimestamp(timestamp)
+            )
+            for row, response, confidence, timestamp in zip(
+                self.response_rows, self.response_values,
+                self.response_confidences, self.response_times
+            )
+        ]
+    
+    def get_trait_dict(self) -> Dict[str, float]:
+        """Get trait scores keyed by trait name"""
+        return dict(zip(TRAIT_NAMES, self.trait_scores.tolist()))
     
     def get_top_traits(self, top_k: int = 5) -> List[Tuple[str, float]]:
         """Get user's strongest traits"""
-        if not self.trait_scores:
+        if not self.trait_scores.size:
             return []
         
-        sorted_traits = sorted(self.trait_scores.items(), key=lambda x: x[1], reverse=True)
+        sorted_traits = sorted(self.get_trait_dict().items(), key=lambda x: x[1], reverse=True)
         return [(trait.replace('_', ' ').title(), score) 
                 for trait, score in sorted_traits[:top_k] if score > 0.5]
     
     def get_progress_summary(self) -> Dict[str, Any]:
         """Get session progress summary"""
-        questions_answered = len(self.responses)
+        questions_answered = self.response_count
         
         # Estimate progress
         if self.state == SessionState.SEED_QUESTIONS:
@@ -105,10 +280,9 @@ class Session(BaseModel):
         # Get current leader
         top_department = None
         top_confidence = 0.0
-        if self.department_probabilities:
-            top_dept, top_conf = max(self.department_probabilities.items(), key=lambda x: x[1])
-            top_department = top_dept
-            top_confidence = top_conf
+        if self.probabilities.size:
+            top_department = self.top_department
+            top_confidence = float(self.probabilities[self.top_department_index])
         
         return {
             "progress_percentage": round(progress * 100, 1),
@@ -123,13 +297,12 @@ class Session(BaseModel):
         """Calculate session duration in minutes"""
         if not self.created_at:
             return 0.0
-        end_time = self.completed_at or datetime.now()
-        duration = end_time - self.created_at
-        return round(duration.total_seconds() / 60.0, 1)
+        end_time = self.completed_at or time.time()
+        return round((end_time - self.created_at) / 60.0, 1)
     
     def update_activity(self):
         """Update last activity timestamp"""
-        self.last_activity = datetime.now()
+        self.last_activity = time.time()
 
 # API Request/Response Models
 class StartSessionRequest(BaseModel):
@@ -143,6 +316,17 @@ class AnswerQuestionRequest(BaseModel):
     response: int = Field(..., ge=1, le=5)
     confidence: float = Field(1.0, ge=0.0, le=1.0)
 
+class BatchAnswer(BaseModel):
+    """One buffered answer in a batch submission"""
+    question_id: str
+    response: int = Field(..., ge=1, le=5)
+    confidence: float = Field(1.0, ge=0.0, le=1.0)
+
+class BatchAnswerRequest(BaseModel):
+    """Request to submit several answers for one session, in order"""
+    session_id: str
+    answers: List[BatchAnswer] = Field(..., min_length=1)
+
 class ExplanationRequest(BaseModel):
     """Request for department explanation"""
     session_id: str
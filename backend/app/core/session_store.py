@@ -0,0 +1,304 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .models import Session, SessionLayout
+from .utils import TRAIT_NAMES
+
+logger = logging.getLogger(__name__)
+
+
+class BaseSessionStore(ABC):
+    """
+    Session storage backend used by the classifier
+
+    ``locked()`` is the only way to modify a session: it serializes
+    concurrent updates to the session and persists whatever the block
+    changed when it exits.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Session]:
+        """Current state of a session, or None; modify it only inside locked()"""
+
+    @abstractmethod
+    def put(self, session: Session):
+        """Insert or replace a session"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Remove a session, returning whether it existed"""
+
+    @abstractmethod
+    def locked(self, session_id: str):
+        """Context manager yielding the session (or None) under its lock"""
+
+    @abstractmethod
+    def values(self) -> List[Session]:
+        """Point-in-time list of all sessions"""
+
+    @abstractmethod
+    def remove_inactive(self, cutoff: float) -> List[Session]:
+        """Delete and return sessions whose last activity is before ``cutoff`` (epoch seconds)"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored sessions"""
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+
+class _Shard:
+    """One hash partition of the session store"""
+    __slots__ = ("lock", "sessions", "session_locks")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions: Dict[str, Session] = {}
+        self.session_locks: Dict[str, threading.Lock] = {}
+
+
+class InMemorySessionStore(BaseSessionStore):
+    """
+    Sharded, thread-safe in-memory session store
+
+    Sessions are spread over ``num_shards`` hash partitions, each guarded by
+    its own lock, so get/put/delete are O(1) and only contend within a
+    shard. Every session also has its own lock; ``locked()`` holds it so
+    concurrent answers for one session are applied one at a time.
+    """
+
+    def __init__(self, num_shards: int = 16):
+        self._shards = [_Shard() for _ in range(max(1, num_shards))]
+
+    def _shard(self, session_id: str) -> _Shard:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def get(self, session_id: str) -> Optional[Session]:
+        shard = self._shard(session_id)
+        with shard.lock:
+            return shard.sessions.get(session_id)
+
+    def put(self, session: Session):
+        shard = self._shard(session.session_id)
+        with shard.lock:
+            shard.sessions[session.session_id] = session
+            shard.session_locks.setdefault(session.session_id, threading.Lock())
+
+    def delete(self, session_id: str) -> bool:
+        shard = self._shard(session_id)
+        with shard.lock:
+            shard.session_locks.pop(session_id, None)
+            return shard.sessions.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        return sum(len(shard.sessions) for shard in self._shards)
+
+    @contextmanager
+    def locked(self, session_id: str) -> Iterator[Optional[Session]]:
+        """Hold a session's lock for the duration of the block; yields None if missing"""
+        shard = self._shard(session_id)
+        with shard.lock:
+            session_lock = shard.session_locks.get(session_id)
+        if session_lock is None:
+            yield None
+            return
+        with session_lock:
+            yield self.get(session_id)
+
+    def values(self) -> List[Session]:
+        """Point-in-time list of all sessions, collected shard by shard"""
+        sessions: List[Session] = []
+        for shard in self._shards:
+            with shard.lock:
+                sessions.extend(shard.sessions.values())
+        return sessions
+
+    def remove_inactive(self, cutoff: float) -> List[Session]:
+        removed: List[Session] = []
+        for shard in self._shards:
+            with shard.lock:
+                expired = [
+                    session for session in shard.sessions.values()
+                    if session.last_activity < cutoff
+                ]
+                for session in expired:
+                    del shard.sessions[session.session_id]
+                    shard.session_locks.pop(session.session_id, None)
+            removed.extend(expired)
+        return removed
+
+
+class SQLiteSessionStore(BaseSessionStore):
+    """
+    Durable session store in a SQLite database in WAL mode
+
+    Sessions are stored as compact blobs (Session.to_bytes), so every
+    worker process on the host that opens the same file shares them.
+    ``locked()`` runs inside a ``BEGIN IMMEDIATE`` transaction, which
+    serializes updates across processes.
+    """
+
+    def __init__(self, path: str, layout: SessionLayout):
+        self.path = path
+        self.layout = layout
+        self._local = threading.local()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with self._transaction(conn):
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, state TEXT NOT NULL, "
+                "last_activity REAL NOT NULL, data BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_last_activity ON sessions (last_activity)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._check_layout(conn)
+
+        # Connections must not be shared across fork(): pre-forked workers open their own
+        self.close_connection()
+        os.register_at_fork(after_in_child=self._reset_connections)
+
+    def _reset_connections(self):
+        self._local = threading.local()
+
+    def close_connection(self):
+        """Close this thread's connection, e.g. once setup is done before forking"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def connection(self) -> sqlite3.Connection:
+        """One connection per thread; transactions are managed explicitly"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """This thread's connection in a write transaction, joining one already open"""
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        with self._transaction(conn):
+            yield conn
+
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _check_layout(self, conn: sqlite3.Connection):
+        """
+        Drop stored sessions written for a different question bank, department
+        set or decision tree (stored trait scores and tree nodes depend on the
+        questions' and departments' content, DECISION_TREE_DEPTH and LEARNING_RATE)
+        """
+        from ..config import settings
+
+        fingerprint = hashlib.sha256("\n".join(
+            list(self.layout.department_ids) + list(self.layout.question_ids) + TRAIT_NAMES + [
+                f"content={self.layout.content_hash}",
+                f"DECISION_TREE_DEPTH={settings.DECISION_TREE_DEPTH}",
+                f"LEARNING_RATE={settings.LEARNING_RATE!r}"
+            ]
+        ).encode("utf-8")).hexdigest()
+
+        row = conn.execute("SELECT value FROM meta WHERE key = 'layout'").fetchone()
+        if row and row[0] != fingerprint:
+            dropped = conn.execute("DELETE FROM sessions").rowcount
+            # Usage counters (usage_stats.py) described the dropped sessions; they are rebuilt
+            conn.execute("DROP TABLE IF EXISTS usage_counters")
+            conn.execute("DROP TABLE IF EXISTS usage_buckets")
+            logger.warning(f"Session layout changed, dropped {dropped} stored sessions")
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('layout', ?)", (fingerprint,)
+        )
+
+    def _decode(self, session_id: str, blob: bytes) -> Session:
+        return Session.from_bytes(self.layout, session_id, blob)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        row = self.connection().execute(
+            "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return self._decode(session_id, row[0]) if row else None
+
+    def put(self, session: Session):
+        self.connection().execute(
+            "INSERT OR REPLACE INTO sessions (session_id, state, last_activity, data) "
+            "VALUES (?, ?, ?, ?)",
+            (session.session_id, session.state.value, session.last_activity, session.to_bytes())
+        )
+
+    def delete(self, session_id: str) -> bool:
+        cursor = self.connection().execute(
+            "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+        )
+        return cursor.rowcount > 0
+
+    @contextmanager
+    def locked(self, session_id: str) -> Iterator[Optional[Session]]:
+        conn = self.connection()
+        with self._transaction(conn):
+            row = conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            session = self._decode(session_id, row[0]) if row else None
+            yield session
+
+            if session is not None:
+                blob = session.to_bytes()
+                if blob != row[0]:
+                    conn.execute(
+                        "UPDATE sessions SET state = ?, last_activity = ?, data = ? "
+                        "WHERE session_id = ?",
+                        (session.state.value, session.last_activity, blob, session_id)
+                    )
+
+    def values(self) -> List[Session]:
+        rows = self.connection().execute("SELECT session_id, data FROM sessions").fetchall()
+        return [self._decode(session_id, blob) for session_id, blob in rows]
+
+    def remove_inactive(self, cutoff: float) -> List[Session]:
+        rows = self.connection().execute(
+            "DELETE FROM sessions WHERE last_activity < ? RETURNING session_id, data", (cutoff,)
+        ).fetchall()
+        return [self._decode(session_id, blob) for session_id, blob in rows]
+
+    def __len__(self) -> int:
+        return self.connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def create_session_store(layout: SessionLayout) -> BaseSessionStore:
+    """Build the session backend selected by SESSION_BACKEND"""
+    from ..config import settings
+
+    backend = settings.SESSION_BACKEND.lower()
+    if backend == "memory":
+        return InMemorySessionStore(settings.SESSION_SHARDS)
+    if backend == "sqlite":
+        logger.info(f"Using SQLite session store at {settings.SESSION_DB_FILE}")
+        return SQLiteSessionStore(settings.SESSION_DB_FILE, layout)
+    raise ValueError(f"Unknown SESSION_BACKEND: {settings.SESSION_BACKEND}")
@@ -0,0 +1,211 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from .models import Session, SessionState
+from .session_store import BaseSessionStore, SQLiteSessionStore
+
+EVENTS = ("started", "answers", "completed", "expired")
+BUCKET_SECONDS = 60
+WINDOWS = {"last_5_minutes": 5 * 60, "last_hour": 60 * 60}
+RESPONSE_VALUES = range(1, 6)
+
+
+class BaseUsageStats(ABC):
+    """
+    Usage statistics maintained from session lifecycle events
+
+    Gauges (sessions per state, the answer histogram, completed sessions
+    per top department) describe the sessions currently stored and are
+    adjusted on start, answer, complete and expire, so reading them costs
+    the same however much traffic there has been. Event counts are also
+    kept in per-minute buckets for the recent-activity windows.
+    """
+
+    @abstractmethod
+    def _add(self, deltas: Dict[str, int], events: Dict[str, int], now: float):
+        """Apply counter deltas and record events in the bucket for ``now``"""
+
+    @abstractmethod
+    def _totals(self) -> Dict[str, int]:
+        """All counters (gauges and lifetime event totals)"""
+
+    @abstractmethod
+    def _window_totals(self, first_bucket: int) -> Dict[str, int]:
+        """Event counts summed over buckets from ``first_bucket`` onwards"""
+
+    @staticmethod
+    def _session_deltas(sessions: Iterable[Session], sign: int) -> Counter:
+        """Gauge contribution of stored sessions, e.g. to remove expired ones"""
+        deltas: Counter = Counter()
+        for session in sessions:
+            deltas[f"state.{session.state.value}"] += sign
+            if session.state == SessionState.COMPLETE:
+                deltas[f"department.{session.top_department}"] += sign
+            for response in session.response_values:
+                deltas[f"response.{response}"] += sign
+        return deltas
+
+    def session_started(self, session: Session):
+        self._add({f"state.{session.state.value}": 1}, {"started": 1}, time.time())
+
+    def answers_recorded(self, previous_state: SessionState, previous_department: Optional[str],
+                         session: Session, responses: Sequence[int]):
+        """Account for answers applied to a session that was in ``previous_state``"""
+        deltas: Counter = Counter()
+        deltas[f"state.{previous_state.value}"] -= 1
+        deltas[f"state.{session.state.value}"] += 1
+        if previous_state == SessionState.COMPLETE:
+            deltas[f"department.{previous_department}"] -= 1
+        if session.state == SessionState.COMPLETE:
+            deltas[f"department.{session.top_department}"] += 1
+        for response in responses:
+            deltas[f"response.{response}"] += 1
+
+        events = {"answers": len(responses)}
+        if session.state == SessionState.COMPLETE and previous_state != SessionState.COMPLETE:
+            events["completed"] = 1
+        self._add(deltas, events, time.time())
+
+    def sessions_expired(self, sessions: Sequence[Session]):
+        if sessions:
+            self._add(self._session_deltas(sessions, -1), {"expired": len(sessions)}, time.time())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current gauges and lifetime event totals"""
+        totals = self._totals()
+        sessions_by_state = {state: totals.get(f"state.{state.value}", 0) for state in SessionState}
+        response_distribution = {
+            str(value): totals[f"response.{value}"]
+            for value in RESPONSE_VALUES if totals.get(f"response.{value}", 0) > 0
+        }
+        completed_by_department = sorted(
+            ((name[len("department."):], count) for name, count in totals.items()
+             if name.startswith("department.") and count > 0),
+            key=lambda x: x[1],
+            reverse=True
+        )
+        return {
+            "sessions_by_state": sessions_by_state,
+            "total_sessions": sum(sessions_by_state.values()),
+            "total_responses": sum(response_distribution.values()),
+            "response_distribution": response_distribution,
+            "completed_by_department": completed_by_department,
+            "events": {event: totals.get(f"events.{event}", 0) for event in EVENTS}
+        }
+
+    def windows(self) -> Dict[str, Dict[str, int]]:
+        """Event counts over the recent-activity windows (minute resolution)"""
+        now = time.time()
+        result = {}
+        for name, seconds in WINDOWS.items():
+            counts = self._window_totals(int((now - seconds) // BUCKET_SECONDS) + 1)
+            result[name] = {event: counts.get(event, 0) for event in EVENTS}
+        return result
+
+
+class InMemoryUsageStats(BaseUsageStats):
+    """Usage statistics for the in-memory session store"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Counter = Counter()
+        self._buckets: "OrderedDict[int, Counter]" = OrderedDict()
+
+    def _add(self, deltas: Dict[str, int], events: Dict[str, int], now: float):
+        bucket_index = int(now // BUCKET_SECONDS)
+        oldest = bucket_index - max(WINDOWS.values()) // BUCKET_SECONDS
+        with self._lock:
+            self._counters.update(deltas)
+            for event, count in events.items():
+                self._counters[f"events.{event}"] += count
+
+            bucket = self._buckets.get(bucket_index)
+            if bucket is None:
+                bucket = self._buckets[bucket_index] = Counter()
+            bucket.update(events)
+            while next(iter(self._buckets)) < oldest:
+                self._buckets.popitem(last=False)
+
+    def _totals(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def _window_totals(self, first_bucket: int) -> Dict[str, int]:
+        counts: Counter = Counter()
+        with self._lock:
+            for bucket_index, bucket in self._buckets.items():
+                if bucket_index >= first_bucket:
+                    counts.update(bucket)
+        return counts
+
+
+class SQLiteUsageStats(BaseUsageStats):
+    """
+    Usage statistics stored next to the sessions in the SQLite database
+
+    Counters are updated on the session store's connection, inside the
+    same transaction as the session change when there is one, so every
+    worker process sees and maintains one consistent set.
+    """
+
+    def __init__(self, store: SQLiteSessionStore):
+        self.store = store
+        with store.transaction() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'usage_counters'"
+            ).fetchone()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage_buckets ("
+                "bucket INTEGER NOT NULL, name TEXT NOT NULL, value INTEGER NOT NULL, "
+                "PRIMARY KEY (bucket, name))"
+            )
+            # Sessions stored before the counters existed are counted once
+            if not exists:
+                self._add(self._session_deltas(store.values(), 1), {}, time.time())
+        store.close_connection()
+
+    def _add(self, deltas: Dict[str, int], events: Dict[str, int], now: float):
+        bucket_index = int(now // BUCKET_SECONDS)
+        counters = [(name, count) for name, count in deltas.items() if count]
+        counters += [(f"events.{event}", count) for event, count in events.items()]
+
+        with self.store.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO usage_counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                counters
+            )
+            if events:
+                conn.executemany(
+                    "INSERT INTO usage_buckets (bucket, name, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (bucket, name) DO UPDATE SET value = value + excluded.value",
+                    [(bucket_index, event, count) for event, count in events.items()]
+                )
+                conn.execute(
+                    "DELETE FROM usage_buckets WHERE bucket < ?",
+                    (bucket_index - max(WINDOWS.values()) // BUCKET_SECONDS,)
+                )
+
+    def _totals(self) -> Dict[str, int]:
+        return dict(self.store.connection().execute(
+            "SELECT name, value FROM usage_counters"
+        ).fetchall())
+
+    def _window_totals(self, first_bucket: int) -> Dict[str, int]:
+        return dict(self.store.connection().execute(
+            "SELECT name, SUM(value) FROM usage_buckets WHERE bucket >= ? GROUP BY name",
+            (first_bucket,)
+        ).fetchall())
+
+
+def create_usage_stats(store: BaseSessionStore) -> BaseUsageStats:
+    """Usage statistics that live wherever the sessions do"""
+    if isinstance(store, SQLiteSessionStore):
+        return SQLiteUsageStats(store)
+    return InMemoryUsageStats()
@@ -2,6 +2,8 @@ import math
 from typing import Dict, List, Union
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 def cosine_similarity(vec_a: Dict[str, float], vec_b: Dict[str, float]) -> float:
@@ -76,6 +78,35 @@ def calculate_entropy(probabilities: Dict[str, float]) -> float:
             entropy -= prob * math.log2(prob)
     return entropy
 
+def softmax_array(scores: np.ndarray, temperature: float = 1.0) -> np.ndarray:
+    """
+    Vectorized softmax over the last axis of a score array
+    
+    Args:
+        scores: Array of raw scores, one row per distribution
+        temperature: Temperature parameter for softmax
+        
+    Returns:
+        Array of the same shape whose last axis sums to 1.0
+    """
+    scaled = np.asarray(scores, dtype=float) / temperature
+    exp_vals = np.exp(scaled - scaled.max(axis=-1, keepdims=True))
+    return exp_vals / exp_vals.sum(axis=-1, keepdims=True)
+
+def entropy_array(probabilities: np.ndarray) -> np.ndarray:
+    """
+    Shannon entropy (bits) over the last axis of a probability array
+    
+    Args:
+        probabilities: Array of probabilities, one row per distribution
+        
+    Returns:
+        Array of entropies with the last axis reduced
+    """
+    probs = np.asarray(probabilities, dtype=float)
+    safe = np.where(probs > 1e-10, probs, 1.0)  # Avoid log(0)
+    return -(probs * np.log2(safe)).sum(axis=-1)
+
 def normalize_probabilities(probs: Dict[str, float]) -> Dict[str, float]:
     """Ensure probabilities sum to 1.0"""
     total = sum(probs.values())
@@ -0,0 +1,138 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from .config import Settings
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Argument types that cannot change between the log call and the writer
+# formatting the record later
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None))
+
+_listener: Optional[QueueListener] = None
+
+
+class SamplingFilter(logging.Filter):
+    """Keep roughly ``rate`` (0-1) of the records logged on one logger"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves message formatting to the writer thread
+
+    The stock QueueHandler renders every record on the calling thread.
+    Here a record is queued with its format string and arguments as long
+    as those are immutable; only tracebacks and mutable arguments are
+    rendered up front.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(arg, _IMMUTABLE_ARGS) for arg in args)):
+            record.msg, record.args = record.getMessage(), None
+        return record
+
+
+def _restart_listener_in_child():
+    """Forked workers get their own queue and writer thread"""
+    if _listener is None:
+        return
+    records = queue.SimpleQueue()
+    _listener.queue = records
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DeferredQueueHandler):
+            handler.queue = records
+    _listener._thread = None
+    _listener.start()
+
+
+def stop_logging():
+    """Write out queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(settings: Settings) -> None:
+    """
+    Configure the root logger from settings
+
+    With LOG_ASYNC, records are queued on the calling thread and a
+    background thread formats and writes them, so the event loop never
+    blocks on stderr. LOG_SAMPLE_RATES maps logger names to the fraction
+    of their records that are kept.
+    """
+    global _listener
+    stop_logging()
+
+    if settings.LOG_FORMAT == "json":
+        formatter: logging.Formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    if settings.LOG_ASYNC:
+        records = queue.SimpleQueue()
+        root.addHandler(DeferredQueueHandler(records))
+        _listener = QueueListener(records, stream_handler)
+        _listener.start()
+    else:
+        root.addHandler(stream_handler)
+
+    configure_sampling(settings.LOG_SAMPLE_RATES)
+
+
+def configure_sampling(rates: Dict[str, float]) -> None:
+    """Install (or replace) a SamplingFilter on each named logger"""
+    for name, rate in rates.items():
+        sampled = logging.getLogger(name)
+        for existing in [f for f in sampled.filters if isinstance(f, SamplingFilter)]:
+            sampled.removeFilter(existing)
+        sampled.addFilter(SamplingFilter(rate))
+
+
+atexit.register(stop_logging)
+os.register_at_fork(after_in_child=_restart_listener_in_child)
@@ -5,14 +5,12 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from datetime import datetime
 
 from .config import settings
-from .api.routes import router
+from .api.routes import router, bulk_classifier, rag_engine
 from .api.middleware import setup_middleware
+from .logging_config import setup_logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+setup_logging(settings)
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +29,11 @@ async def lifespan(app: FastAPI):
             raise FileNotFoundError(f"Questions file not found: {settings.QUESTIONS_FILE}")
         
         logger.info("✅ Data files validated")
+        
+        # Classification serves right away; explanations use the simple fallback until RAG is ready.
+        # Pre-forked workers find the index already prepared (run.py) and only create the LLM client
+        if rag_engine:
+            rag_engine.start_warm_up()
         logger.info("🎯 Taqneeq Department Classifier ready!")
         
     except Exception as e:
@@ -41,6 +44,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("👋 Shutting down...")
+    bulk_classifier.close()
 
 # Create FastAPI app
 app = FastAPI(
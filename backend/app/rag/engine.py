@@ -1,9 +1,17 @@
 import os
+import time
+import asyncio
+import shutil
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Any, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from .explanation_cache import ExplanationCache
+from .sections import EXPLANATION_SECTIONS, SectionStreamParser, section_for_header
+
 logger = logging.getLogger(__name__)
 
 # Check for RAG dependencies
@@ -13,6 +21,8 @@ try:
     from langchain_community.embeddings import HuggingFaceEmbeddings
     from langchain_community.vectorstores import FAISS
     from langchain.docstore.document import Document
+    from langchain.embeddings import CacheBackedEmbeddings
+    from langchain.storage import LocalFileStore
     RAG_AVAILABLE = True
 except ImportError:
     logger.warning("RAG dependencies not installed. Install with: pip install langchain langchain-community sentence-transformers faiss-cpu")
@@ -26,6 +36,45 @@ except ImportError:
     logger.warning("OpenAI not available. Install with: pip install langchain-openai openai")
     OPENAI_AVAILABLE = False
 
+# Steps reported while warming up; building_index replaces a missing or stale saved index
+WARM_UP_STAGES = ("loading_embeddings", "loading_index", "building_index", "precomputing_contexts", "loading_llm")
+
+# Explanation generators, best first; each falls back to the ones after it
+EXPLANATION_METHODS = ("rag", "template", "simple")
+
+# Bump when document building or chunking changes so persisted indexes are rebuilt
+INDEX_FORMAT_VERSION = 1
+
+class DepartmentContext(NamedTuple):
+    """Retrieval results for one department, computed once per index"""
+    documents: List[Any]    # Documents retrieved for LLM explanations
+    context: str            # Context passage for the LLM prompt, department's own text first
+    highlights: List[str]   # Bullet points from the department's own documents (template explanations)
+
+
+class ExplanationStream:
+    """
+    An explanation delivered piece by piece
+
+    Iterating yields (section, text) pieces in order. A (None, "") piece
+    means the text so far is abandoned (the LLM failed part-way) and the
+    sections start again. Once iteration has finished, ``explanation``
+    holds the complete sections and ``method`` how they were generated.
+    """
+    
+    def __init__(self, method: str, explanation: Optional[Dict[str, str]] = None):
+        self.method = method
+        self.explanation = explanation
+        self.pieces: Optional[AsyncIterator[Tuple[Optional[str], str]]] = None
+    
+    def __aiter__(self) -> AsyncIterator[Tuple[Optional[str], str]]:
+        return self.pieces if self.pieces is not None else self._whole_sections()
+    
+    async def _whole_sections(self) -> AsyncIterator[Tuple[Optional[str], str]]:
+        for section, text in self.explanation.items():
+            yield section, text
+
+
 class TaqneeqRAG:
     """
     Simplified RAG system for generating department explanations
@@ -36,39 +85,190 @@ class TaqneeqRAG:
         self.vector_store = None
         self.llm = None
         self.embeddings = None
+        self.department_contexts: Dict[str, DepartmentContext] = {}
         self.initialized = False
+        self.retrieval_ready = False  # Index loaded and department contexts computed
+        
+        # Warm-up progress, reported by status()
+        self.state = "pending" if RAG_AVAILABLE else "unavailable"
+        self.stage: Optional[str] = None
+        self.stages_completed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._warm_up_lock = threading.Lock()
+        
+        from ..config import settings
+        
+        # LLM calls in flight at once (async path); callers beyond this wait for a slot
+        self._llm_slots = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        
+        # Explanations shared by users with similar profiles
+        self.content_version = self._index_key()
+        self.explanation_cache: Optional[ExplanationCache] = None
+        if settings.EXPLANATION_CACHE_SIZE > 0:
+            self.explanation_cache = ExplanationCache(
+                settings.EXPLANATION_CACHE_SIZE,
+                settings.EXPLANATION_CACHE_TTL,
+                settings.EXPLANATION_CACHE_FILE
+            )
+    
+    def start_warm_up(self) -> Optional[threading.Thread]:
+        """Initialize in a background thread; explanations use the simple fallback until it finishes"""
+        if self.state != "pending":
+            return None
+        thread = threading.Thread(target=self.warm_up, name="rag-warm-up", daemon=True)
+        thread.start()
+        return thread
+    
+    def prepare_for_fork(self):
+        """
+        Load the index and precompute department contexts before forking workers
         
-        if RAG_AVAILABLE:
+        Workers inherit the results copy-on-write and their warm-up only
+        creates the LLM client. Torch and FAISS are kept single-threaded
+        here: thread pools started before fork() do not exist in the
+        children and can deadlock them.
+        """
+        with self._warm_up_lock:
+            if self.state != "pending" or not RAG_AVAILABLE:
+                return
+            
+            self.state = "warming_up"
+            self.started_at = time.time()
             try:
-                self._initialize_rag()
+                self._limit_native_threads()
+                self._initialize_retrieval()
+                self.retrieval_ready = True
+                self.state = "pending"
+                logger.info(f"RAG index prepared for workers after {time.time() - self.started_at:.1f}s")
+            except Exception as e:
+                self.state = "failed"
+                self.error = str(e)
+                self.finished_at = time.time()
+                logger.error(f"Failed to initialize RAG: {e}")
+                logger.info("Falling back to simple explanations")
+            finally:
+                if self.stage is not None:
+                    self.stages_completed += 1
+                self.stage = None
+    
+    def _limit_native_threads(self):
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        try:
+            import torch
+            torch.set_num_threads(1)
+            torch.set_num_interop_threads(1)
+        except (ImportError, RuntimeError) as e:
+            logger.debug(f"Could not limit torch threads: {e}")
+        try:
+            import faiss
+            faiss.omp_set_num_threads(1)
+        except (ImportError, AttributeError) as e:
+            logger.debug(f"Could not limit FAISS threads: {e}")
+    
+    def warm_up(self):
+        """Load embeddings, the vector index and the LLM (blocking, runs once)"""
+        with self._warm_up_lock:
+            if self.state != "pending":
+                return
+            if not RAG_AVAILABLE:
+                logger.info("RAG system disabled - using fallback explanations")
+                return
+            
+            self.state = "warming_up"
+            if self.started_at is None:
+                self.started_at = time.time()
+            try:
+                if not self.retrieval_ready:
+                    self._initialize_retrieval()
+                    self.retrieval_ready = True
+                self._initialize_llm()
                 self.initialized = True
+                self.state = "ready"
+                logger.info(f"RAG ready after {time.time() - self.started_at:.1f}s")
             except Exception as e:
+                self.state = "failed"
+                self.error = str(e)
                 logger.error(f"Failed to initialize RAG: {e}")
                 logger.info("Falling back to simple explanations")
-        else:
-            logger.info("RAG system disabled - using fallback explanations")
+            finally:
+                self.stage = None
+                self.finished_at = time.time()
+    
+    def status(self) -> Dict[str, Any]:
+        """Warm-up state, progress and timing"""
+        now = self.finished_at or time.time()
+        progress = 1.0 if self.state == "ready" else self.stages_completed / len(WARM_UP_STAGES)
+        return {
+            "state": self.state,
+            "stage": self.stage,
+            "progress": round(progress, 2),
+            "elapsed_seconds": round(now - self.started_at, 3) if self.started_at else None,
+            "error": self.error
+        }
+    
+    def _begin_stage(self, stage: str):
+        if self.stage is not None:
+            self.stages_completed += 1
+        self.stage = stage
+        logger.info(f"RAG warm-up: {stage}")
     
-    def _initialize_rag(self):
-        """Initialize RAG components"""
+    def _initialize_retrieval(self):
+        """Load embeddings and the vector index, then precompute department contexts"""
         from ..config import settings
         
         # Initialize embeddings
+        self._begin_stage("loading_embeddings")
         self.embeddings = HuggingFaceEmbeddings(
             model_name=settings.EMBEDDING_MODEL,
             model_kwargs={'device': 'cpu'},
             encode_kwargs={'normalize_embeddings': True}
         )
+        cache_dir = Path(settings.DATA_DIR) / "rag_cache"
+        if settings.RAG_PERSIST_INDEX:
+            # Chunk embeddings are reused across rebuilds; only new or edited text is embedded
+            self.embeddings = CacheBackedEmbeddings.from_bytes_store(
+                self.embeddings,
+                LocalFileStore(str(cache_dir / "embeddings")),
+                namespace=settings.EMBEDDING_MODEL
+            )
+        
+        self._begin_stage("loading_index")
+        if settings.RAG_PERSIST_INDEX:
+            self.vector_store = self._load_or_build_vector_store(cache_dir / "index")
+        else:
+            self.vector_store = self._build_vector_store()
+        
+        # Retrieval queries depend only on the department, so search once here
+        if self.vector_store is not None:
+            self._begin_stage("precomputing_contexts")
+            for dept_id, department in self.departments.items():
+                try:
+                    self.department_contexts[dept_id] = self._retrieve_context(department)
+                except Exception as e:
+                    logger.warning(f"Failed to precompute context for {dept_id}: {e}")
+            logger.info(f"Precomputed retrieval contexts for {len(self.department_contexts)} departments")
+    
+    def _initialize_llm(self):
+        """Create the LLM client if an API key is available"""
+        from ..config import settings
         
-        # Initialize LLM if API key available
+        self._begin_stage("loading_llm")
         if settings.OPENAI_API_KEY and OPENAI_AVAILABLE:
             self.llm = ChatOpenAI(
                 model_name="gpt-3.5-turbo",
                 temperature=0.7,
-                openai_api_key=settings.OPENAI_API_KEY
+                openai_api_key=settings.OPENAI_API_KEY,
+                openai_api_base=settings.OPENAI_BASE_URL
             )
             logger.info("OpenAI LLM initialized")
         else:
             logger.info("OpenAI not configured - using template-based explanations")
+    
+    def _build_vector_store(self):
+        """Embed the department documents and PDF chunks into a new FAISS index"""
+        from ..config import settings
         
         # Process documents
         documents = []
@@ -91,12 +291,67 @@ class TaqneeqRAG:
         
         # Build vector store
         if documents:
-            self.vector_store = FAISS.from_documents(documents, self.embeddings)
+            vector_store = FAISS.from_documents(documents, self.embeddings)
             logger.info(f"RAG initialized with {len(documents)} documents")
+            return vector_store
         else:
             logger.warning("No documents loaded for RAG")
+            return None
     
-    def _create_department_documents(self) -> List[Document]:
+    def _index_key(self) -> str:
+        """Content hash of everything the vector index is built from"""
+        from ..config import settings
+        
+        digest = hashlib.sha256(f"{INDEX_FORMAT_VERSION}:{settings.EMBEDDING_MODEL}".encode("utf-8"))
+        for path in (Path(settings.DEPARTMENTS_FILE), Path(settings.PDF_FILE)):
+            digest.update(b"\0")
+            if path.exists():
+                digest.update(path.read_bytes())
+        return digest.hexdigest()[:32]
+    
+    def _load_or_build_vector_store(self, index_dir: Path):
+        """
+        Load the FAISS index saved for the current inputs, or build and save it
+        
+        Indexes live in ``index_dir/<key>``, where the key hashes the PDF,
+        departments.json and the embedding model; any other saved index is
+        stale and removed once the new one is written.
+        """
+        key = self.content_version
+        path = index_dir / key
+        
+        if path.exists():
+            try:
+                vector_store = FAISS.load_local(
+                    str(path), self.embeddings,
+                    allow_dangerous_deserialization=True  # Written by this process family, not user input
+                )
+                logger.info(f"Loaded RAG index {key} with {vector_store.index.ntotal} vectors")
+                return vector_store
+            except Exception as e:
+                logger.warning(f"Failed to load saved RAG index {key}, rebuilding: {e}")
+        
+        self._begin_stage("building_index")
+        vector_store = self._build_vector_store()
+        if vector_store is None:
+            return None
+        
+        try:
+            # Write next to the final location and rename, so readers never see a partial index
+            tmp_path = index_dir / f".{key}.{os.getpid()}"
+            vector_store.save_local(str(tmp_path))
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp_path, path)
+            for stale in index_dir.iterdir():
+                if stale.name != key and not stale.name.startswith("."):
+                    shutil.rmtree(stale, ignore_errors=True)
+            logger.info(f"Saved RAG index {key}")
+        except Exception as e:
+            logger.warning(f"Failed to save RAG index: {e}")
+        
+        return vector_store
+    
+    def _create_department_documents(self) -> List["Document"]:
         """Create searchable documents from department data"""
         if not RAG_AVAILABLE:
             return []
@@ -170,7 +425,7 @@ class TaqneeqRAG:
         logger.info(f"Created {len(documents)} department documents")
         return documents
     
-    def _load_pdf(self, pdf_path: str) -> List[Document]:
+    def _load_pdf(self, pdf_path: str) -> List["Document"]:
         """Load and process PDF document"""
         if not RAG_AVAILABLE:
             return []
@@ -204,7 +459,7 @@ class TaqneeqRAG:
             logger.error(f"Failed to load PDF {pdf_path}: {e}")
             return []
     
-    def generate_explanation(self, department_id: str, user_session: Any) -> Dict[str, str]:
+    def generate_explanation(self, department_id: str, user_session: Any) -> Tuple[Dict[str, str], str]:
         """
         Generate explanation for department match
         
@@ -213,102 +468,278 @@ class TaqneeqRAG:
             user_session: User session with trait scores and responses
             
         Returns:
-            Dictionary with explanation sections
+            Dictionary with explanation sections, and the method that
+            produced it (rag, template, simple or fallback)
         """
         department = self.departments.get(department_id)
         if not department:
-            return self._fallback_explanation(department_id, "Department not found")
+            return self._fallback_explanation(department_id, "Department not found"), "fallback"
+        
+        method = self.generation_method
+        key, cached = self._cached_explanation(department_id, method, user_session)
+        if cached is not None:
+            return cached, method
+        return self._generate_with_fallbacks(department, user_session, method, key)
+    
+    async def generate_explanation_async(self, department_id: str,
+                                         user_session: Any) -> Tuple[Dict[str, str], str]:
+        """
+        Generate explanation without blocking the event loop on the LLM
+        
+        At most LLM_MAX_CONCURRENCY LLM calls run at once. A call that has
+        not finished within LLM_TIMEOUT seconds, including time spent waiting
+        for a slot, is abandoned for the template explanation. Returns the
+        sections and the method that produced them, as generate_explanation.
+        """
+        department = self.departments.get(department_id)
+        method = self.generation_method
+        if not department or method != "rag":
+            # Template and simple explanations are built in memory
+            return await self._cache_io(self.generate_explanation, department_id, user_session)
+        
+        key, cached = await self._cache_io(self._cached_explanation, department_id, method, user_session)
+        if cached is not None:
+            return cached, method
         
         try:
-            # Use RAG if fully initialized
-            if self.initialized and self.vector_store and self.llm:
-                return self._rag_explanation(department, user_session)
-            elif self.initialized and self.vector_store:
-                return self._template_explanation(department, user_session)
-            else:
-                return self._simple_explanation(department, user_session)
-                
+            explanation = await self._rag_explanation_async(department, user_session)
         except Exception as e:
-            logger.error(f"Explanation generation failed: {e}")
-            return self._simple_explanation(department, user_session)
+            logger.error(f"Rag explanation failed: {e!r}")
+            return self._generate_with_fallbacks(department, user_session, "template")
+        
+        if key is not None:
+            await self._cache_io(self.explanation_cache.put, key, explanation)
+        return explanation, method
     
-    def _rag_explanation(self, department: Any, user_session: Any) -> Dict[str, str]:
-        """Generate RAG-powered explanation using LLM"""
+    async def stream_explanation(self, department_id: str, user_session: Any) -> ExplanationStream:
+        """
+        Explanation as a stream of section pieces
+        
+        LLM output is passed on token by token, under the same concurrency
+        limit as generate_explanation_async and with LLM_TIMEOUT applied to
+        each wait for the next token. Cached, template and simple
+        explanations are complete up front and arrive as one piece per
+        section.
+        """
+        department = self.departments.get(department_id)
+        method = self.generation_method
+        if not department or method != "rag":
+            explanation, method = await self._cache_io(self.generate_explanation, department_id, user_session)
+            return ExplanationStream(method, explanation)
+        
+        key, cached = await self._cache_io(self._cached_explanation, department_id, method, user_session)
+        if cached is not None:
+            return ExplanationStream(method, cached)
+        
+        stream = ExplanationStream(method)
+        stream.pieces = self._stream_rag_explanation(stream, department, user_session, key)
+        return stream
+    
+    async def _stream_rag_explanation(self, stream: ExplanationStream, department: Any, user_session: Any,
+                                      key: Optional[Tuple]) -> AsyncIterator[Tuple[Optional[str], str]]:
+        """Pieces of a streamed LLM explanation, falling back to the template if the LLM fails"""
+        from ..config import settings
+        
+        prompt = self._explanation_prompt(department, user_session)
+        parser = SectionStreamParser()
+        response_parts: List[str] = []
+        sent = False
         try:
-            from .prompts import EXPLANATION_PROMPT
-            
-            # Retrieve relevant context
-            query = f"{department.name} department responsibilities skills requirements tasks"
-            docs = self.vector_store.similarity_search(
-                query, 
-                k=min(5, self.vector_store.index.ntotal)
-            )
-            
-            # Build context from retrieved documents
-            context_parts = []
-            for doc in docs:
-                # Prioritize department-specific content
-                if doc.metadata.get('department_id') == department.id:
-                    context_parts.insert(0, doc.page_content)
-                else:
-                    context_parts.append(doc.page_content)
-            
-            context = "\n\n---\n\n".join(context_parts[:3])  # Limit context length
-            
-            # Get user traits
-            top_traits = user_session.get_top_traits(3)
-            traits_text = ", ".join([f"{trait} ({score:.1%})" for trait, score in top_traits])
-            
-            # Generate explanation using LLM
-            prompt = EXPLANATION_PROMPT.format(
-                department_name=department.name,
-                department_description=department.description,
-                user_traits=traits_text or "Balanced across multiple areas",
-                context=context[:1500],  # Limit context length
-                questions_answered=len(user_session.responses)
-            )
-            
-            response = self.llm.predict(prompt)
-            
-            # Parse response into sections
-            return self._parse_llm_response(response)
-            
+            await asyncio.wait_for(self._llm_slots.acquire(), timeout=settings.LLM_TIMEOUT)
+            chunks = None
+            try:
+                chunks = self.llm.astream(prompt).__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=settings.LLM_TIMEOUT)
+                    except StopAsyncIteration:
+                        break
+                    response_parts.append(chunk.content)
+                    for piece in parser.feed(chunk.content):
+                        sent = True
+                        yield piece
+                for piece in parser.close():
+                    sent = True
+                    yield piece
+            finally:
+                self._llm_slots.release()
+                if chunks is not None:
+                    await chunks.aclose()
         except Exception as e:
-            logger.error(f"RAG explanation failed: {e}")
-            return self._template_explanation(department, user_session)
+            logger.error(f"Rag explanation stream failed: {e!r}")
+            stream.explanation, stream.method = self._generate_with_fallbacks(department, user_session, "template")
+            if sent:
+                yield None, ""
+            for section, text in stream.explanation.items():
+                yield section, text
+            return
+        
+        stream.explanation = self._parse_llm_response("".join(response_parts))
+        if key is not None:
+            await self._cache_io(self.explanation_cache.put, key, stream.explanation)
+    
+    async def _cache_io(self, func, *args):
+        """Call ``func`` on a worker thread if it may touch the explanation cache's disk tier"""
+        if self.explanation_cache is not None and self.explanation_cache.persistent:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+    
+    def _cached_explanation(self, department_id: str, method: str,
+                            user_session: Any) -> Tuple[Optional[Tuple], Optional[Dict[str, str]]]:
+        """Cache key for this request (None if not cached) and the cached explanation, if any"""
+        if self.explanation_cache is None or method == "simple":
+            return None, None
+        key = self._explanation_cache_key(department_id, method, user_session)
+        return key, self.explanation_cache.get(key)
+    
+    def _generate_with_fallbacks(self, department: Any, user_session: Any, method: str,
+                                 key: Optional[Tuple] = None) -> Tuple[Dict[str, str], str]:
+        """Generate with ``method``, falling back to the next, cheaper one if it fails; returns the method used"""
+        generators = {
+            "rag": self._rag_explanation,
+            "template": self._template_explanation,
+            "simple": self._simple_explanation
+        }
+        for attempt in EXPLANATION_METHODS[EXPLANATION_METHODS.index(method):]:
+            try:
+                explanation = generators[attempt](department, user_session)
+            except Exception as e:
+                logger.error(f"{attempt.title()} explanation failed: {e}")
+                continue
+            
+            # Fallback results are not cached, so the preferred method is tried again next time
+            if key is not None and attempt == method:
+                self.explanation_cache.put(key, explanation)
+            return explanation, attempt
+        
+        return self._fallback_explanation(department.id, "Explanation generation failed"), "fallback"
+    
+    @property
+    def generation_method(self) -> str:
+        """How explanations are currently produced: rag (LLM), template or simple"""
+        if self.initialized and self.vector_store and self.llm:
+            return "rag"
+        elif self.initialized and self.vector_store:
+            return "template"
+        return "simple"
+    
+    def _explanation_cache_key(self, department_id: str, method: str, user_session: Any) -> Tuple:
+        """
+        Cache key for an explanation: users with the same top traits get the same one
+        
+        LLM prompts quote trait strengths and the number of answers, so LLM
+        output is shared by profiles on the same coarse trait grid and
+        answer-count bucket. Template text depends only on which traits
+        lead and the exact answer count, so it is keyed on exactly those.
+        """
+        from ..config import settings
+        
+        top_traits = user_session.get_top_traits(3)
+        if method == "rag":
+            grid = settings.EXPLANATION_CACHE_TRAIT_GRID
+            traits = tuple((trait, int(score / grid)) for trait, score in top_traits)
+            questions = user_session.response_count // settings.EXPLANATION_CACHE_QUESTIONS_BUCKET
+        else:
+            traits = tuple(trait for trait, _ in top_traits)
+            questions = user_session.response_count
+        return (self.content_version, department_id, method, traits, questions)
+    
+    def _retrieve_context(self, department: Any) -> DepartmentContext:
+        """Run the retrieval queries for a department against the vector store"""
+        # Retrieve relevant context
+        query = f"{department.name} department responsibilities skills requirements tasks"
+        docs = self.vector_store.similarity_search(
+            query, 
+            k=min(5, self.vector_store.index.ntotal)
+        )
+        
+        # Build context from retrieved documents
+        context_parts = []
+        for doc in docs:
+            # Prioritize department-specific content
+            if doc.metadata.get('department_id') == department.id:
+                context_parts.insert(0, doc.page_content)
+            else:
+                context_parts.append(doc.page_content)
+        
+        context = "\n\n---\n\n".join(context_parts[:3])  # Limit context length
+        
+        # Retrieve template context without LLM
+        query = f"{department.name} responsibilities tasks"
+        template_docs = self.vector_store.similarity_search(query, k=2)
+        
+        # Extract key information from context
+        highlights = []
+        for doc in template_docs:
+            if doc.metadata.get('department_id') == department.id:
+                content = doc.page_content
+                # Extract specific responsibilities or tasks
+                lines = content.split('\n')
+                for line in lines:
+                    line = line.strip()
+                    if line.startswith('•') or line.startswith('-'):
+                        highlights.append(line.strip('•- '))
+        
+        return DepartmentContext(docs, context, highlights)
+    
+    def _department_context(self, department: Any) -> DepartmentContext:
+        """Precomputed retrieval results, searching only if warm-up could not precompute them"""
+        context = self.department_contexts.get(department.id)
+        if context is None:
+            context = self._retrieve_context(department)
+        return context
+    
+    def _rag_explanation(self, department: Any, user_session: Any) -> Dict[str, str]:
+        """Generate RAG-powered explanation using LLM"""
+        response = self.llm.invoke(self._explanation_prompt(department, user_session))
+        
+        # Parse response into sections
+        return self._parse_llm_response(response.content)
+    
+    async def _rag_explanation_async(self, department: Any, user_session: Any) -> Dict[str, str]:
+        """_rag_explanation on the LLM's async client, bounded by the slot semaphore and LLM_TIMEOUT"""
+        from ..config import settings
+        
+        prompt = self._explanation_prompt(department, user_session)
+        
+        async def call_llm():
+            async with self._llm_slots:
+                return await self.llm.ainvoke(prompt)
+        
+        response = await asyncio.wait_for(call_llm(), timeout=settings.LLM_TIMEOUT)
+        return self._parse_llm_response(response.content)
+    
+    def _explanation_prompt(self, department: Any, user_session: Any) -> str:
+        """LLM prompt for a department and the user's profile"""
+        from .prompts import EXPLANATION_PROMPT
+        
+        context = self._department_context(department).context
+        
+        # Get user traits
+        top_traits = user_session.get_top_traits(3)
+        traits_text = ", ".join([f"{trait} ({score:.1%})" for trait, score in top_traits])
+        
+        return EXPLANATION_PROMPT.format(
+            department_name=department.name,
+            department_description=department.description,
+            user_traits=traits_text or "Balanced across multiple areas",
+            context=context[:1500],  # Limit context length
+            questions_answered=user_session.response_count
+        )
     
     def _template_explanation(self, department: Any, user_session: Any) -> Dict[str, str]:
         """Generate explanation using templates with retrieved context"""
-        try:
-            # Retrieve relevant context without LLM
-            query = f"{department.name} responsibilities tasks"
-            docs = self.vector_store.similarity_search(query, k=2)
-            
-            # Extract key information from context
-            context_info = []
-            for doc in docs:
-                if doc.metadata.get('department_id') == department.id:
-                    content = doc.page_content
-                    # Extract specific responsibilities or tasks
-                    lines = content.split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith('•') or line.startswith('-'):
-                            context_info.append(line.strip('•- '))
-            
-            top_traits = user_session.get_top_traits(3)
-            
-            return {
-                "overview": f"Based on your {len(user_session.responses)} responses, you're well-suited for the {department.name} department.",
-                "why_good_fit": self._build_fit_explanation(top_traits, department),
-                "responsibilities": self._format_responsibilities(department, context_info),
-                "skills_gained": self._format_skills_gained(department),
-                "next_steps": f"Apply to {department.name} and connect with current members to learn about ongoing projects and opportunities."
-            }
-            
-        except Exception as e:
-            logger.error(f"Template explanation failed: {e}")
-            return self._simple_explanation(department, user_session)
+        context_info = self._department_context(department).highlights
+        
+        top_traits = user_session.get_top_traits(3)
+        
+        return {
+            "overview": f"Based on your {user_session.response_count} responses, you're well-suited for the {department.name} department.",
+            "why_good_fit": self._build_fit_explanation(top_traits, department),
+            "responsibilities": self._format_responsibilities(department, context_info),
+            "skills_gained": self._format_skills_gained(department),
+            "next_steps": f"Apply to {department.name} and connect with current members to learn about ongoing projects and opportunities."
+        }
     
     def _simple_explanation(self, department: Any, user_session: Any) -> Dict[str, str]:
         """Generate simple explanation without external dependencies"""
@@ -368,13 +799,7 @@ class TaqneeqRAG:
     
     def _parse_llm_response(self, response: str) -> Dict[str, str]:
         """Parse LLM response into structured sections"""
-        sections = {
-            "overview": "",
-            "why_good_fit": "",
-            "responsibilities": "",
-            "skills_gained": "",
-            "next_steps": ""
-        }
+        sections = {section: "" for section in EXPLANATION_SECTIONS}
         
         current_section = "overview"
         lines = response.split('\n')
@@ -384,19 +809,7 @@ class TaqneeqRAG:
             
             # Check for section headers
             if line.startswith('##'):
-                section_name = line.replace('#', '').strip().lower()
-                section_name = section_name.replace(' ', '_').replace("'", "")
-                
-                if 'overview' in section_name:
-                    current_section = "overview"
-                elif 'fit' in section_name or 'good' in section_name:
-                    current_section = "why_good_fit"
-                elif 'do' in section_name or 'responsibilities' in section_name:
-                    current_section = "responsibilities"
-                elif 'gain' in section_name or 'skills' in section_name:
-                    current_section = "skills_gained"
-                elif 'next' in section_name or 'steps' in section_name:
-                    current_section = "next_steps"
+                current_section = section_for_header(line) or current_section
                 continue
             
             # Add content to current section
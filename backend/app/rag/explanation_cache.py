@@ -0,0 +1,131 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ExplanationCache:
+    """
+    Bounded, thread-safe LRU cache of generated explanations with a TTL
+
+    Entries older than ``ttl`` seconds are treated as missing. With
+    ``db_file`` set, every entry is also written to a SQLite table that is
+    consulted on a memory miss, so explanations survive restarts and are
+    shared by worker processes. Each process and thread opens its own
+    connection on first use (connections must not cross fork()); disk
+    reads and writes block the caller, so async code should run them on a
+    worker thread when ``persistent`` is set.
+    """
+
+    def __init__(self, max_size: int, ttl: float, db_file: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self.db_file = db_file
+        self._local = threading.local()
+        if db_file:
+            os.register_at_fork(after_in_child=self._reset_connections)
+
+    def _reset_connections(self):
+        self._local = threading.local()
+
+    @property
+    def persistent(self) -> bool:
+        return self.db_file is not None
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection to the disk tier, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS explanations ("
+                "key TEXT PRIMARY KEY, created_at REAL NOT NULL, explanation TEXT NOT NULL)"
+            )
+            conn.execute("DELETE FROM explanations WHERE created_at < ?", (time.time() - self.ttl,))
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Dict[str, str]]:
+        """Look up a fresh explanation, refreshing its recency on a hit"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+
+        if self.persistent:
+            row = self._connection().execute(
+                "SELECT created_at, explanation FROM explanations WHERE key = ? AND created_at >= ?",
+                (json.dumps(key), now - self.ttl)
+            ).fetchone()
+            if row is not None:
+                explanation = json.loads(row[1])
+                with self._lock:
+                    self._store(key, row[0], explanation)
+                    self.disk_hits += 1
+                return explanation
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: Hashable, explanation: Dict[str, str]):
+        """Store an explanation, evicting the least recently used entry when full"""
+        now = time.time()
+        with self._lock:
+            self._store(key, now, explanation)
+        if self.persistent:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO explanations (key, created_at, explanation) VALUES (?, ?, ?)",
+                (json.dumps(key), now, json.dumps(explanation))
+            )
+
+    def _store(self, key: Hashable, created_at: float, explanation: Dict[str, str]):
+        self._entries[key] = (created_at, explanation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all entries, on disk too (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+        if self.persistent:
+            self._connection().execute("DELETE FROM explanations")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters for monitoring"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "persistent": self.persistent,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+        }
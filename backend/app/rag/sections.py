@@ -0,0 +1,89 @@
+import re
+from typing import List, Optional, Tuple
+
+EXPLANATION_SECTIONS = ("overview", "why_good_fit", "responsibilities", "skills_gained", "next_steps")
+
+_LINE_BREAK = re.compile(r"(\n)")
+
+
+def section_for_header(line: str) -> Optional[str]:
+    """Explanation section named by a '## ...' header line, or None if it names none"""
+    section_name = line.replace('#', '').strip().lower()
+    section_name = section_name.replace(' ', '_').replace("'", "")
+
+    if 'overview' in section_name:
+        return "overview"
+    elif 'fit' in section_name or 'good' in section_name:
+        return "why_good_fit"
+    elif 'do' in section_name or 'responsibilities' in section_name:
+        return "responsibilities"
+    elif 'gain' in section_name or 'skills' in section_name:
+        return "skills_gained"
+    elif 'next' in section_name or 'steps' in section_name:
+        return "next_steps"
+    return None
+
+
+class SectionStreamParser:
+    """
+    Split streamed LLM text into (section, text) pieces as it arrives
+
+    Text is passed on as soon as it cannot belong to a '##' header line;
+    only a line that may still turn out to be a header is held back until
+    its newline. Header lines switch the current section (as in
+    TaqneeqRAG._parse_llm_response) and are not passed on, nor is
+    whitespace at the start of a section.
+    """
+
+    def __init__(self):
+        self.section = "overview"
+        self._line = ""          # Held-back start of the current line
+        self._holding = True     # The current line may still be a header
+        self._started = set()    # Sections that have received text
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """Pieces of ``text`` that can be passed on now"""
+        pieces: List[Tuple[str, str]] = []
+        for part in _LINE_BREAK.split(text):
+            if not part:
+                continue
+            if part == "\n":
+                if self._holding:
+                    self._end_held_line(pieces)
+                self._emit(pieces, "\n")
+                self._line, self._holding = "", True
+            elif self._holding:
+                self._line += part
+                start = self._line.lstrip()
+                if start and start != "#" and not start.startswith("##"):
+                    self._emit(pieces, self._line)
+                    self._line, self._holding = "", False
+            else:
+                self._emit(pieces, part)
+        return pieces
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Pieces still held back once the stream has ended"""
+        pieces: List[Tuple[str, str]] = []
+        if self._holding:
+            self._end_held_line(pieces)
+        self._line = ""
+        return pieces
+
+    def _end_held_line(self, pieces: List[Tuple[str, str]]):
+        line = self._line.strip()
+        if line.startswith('##'):
+            self.section = section_for_header(line) or self.section
+        elif line:
+            self._emit(pieces, self._line)
+
+    def _emit(self, pieces: List[Tuple[str, str]], text: str):
+        if self.section not in self._started:
+            text = text.lstrip()
+            if not text:
+                return
+            self._started.add(self.section)
+        if pieces and pieces[-1][0] == self.section:
+            pieces[-1] = (self.section, pieces[-1][1] + text)
+        else:
+            pieces.append((self.section, text))
@@ -0,0 +1,49 @@
+"""
+Per-turn cost of adaptive question selection as answers accumulate.
+
+The session history is padded with repeated seed-question answers so the
+adaptive candidate pool stays the same size and only the history grows.
+With incremental per-session bookkeeping the cost per turn should stay flat.
+
+Run from the backend directory:
+    python benchmarks/bench_adaptive_selection.py
+"""
+import os
+import sys
+import time
+import logging
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+os.chdir(backend_dir)
+logging.disable(logging.CRITICAL)
+
+from app.core.classifier import TaqneeqClassifier  # noqa: E402
+
+HISTORY_LENGTHS = [4, 16, 64, 256, 1024, 4096]
+REPEATS = 200
+
+
+def main():
+    classifier = TaqneeqClassifier()
+    seed_ids = [q.id for q in classifier.seed_questions]
+
+    print(f"{'answers':>8} {'candidates':>11} {'us/turn':>10}")
+    for history in HISTORY_LENGTHS:
+        session_id, _ = classifier.start_session()
+        for i in range(history):
+            classifier.process_response(session_id, seed_ids[i % len(seed_ids)], (i % 5) + 1)
+        session = classifier.sessions.get(session_id)
+        candidates = int((classifier.adaptive_mask & ~session.asked_mask).sum())
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            classifier._select_best_question(session)
+        per_turn = (time.perf_counter() - start) / REPEATS * 1e6
+
+        print(f"{history:>8} {candidates:>11} {per_turn:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
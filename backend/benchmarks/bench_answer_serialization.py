@@ -0,0 +1,101 @@
+"""
+Serialization cost per /classification/answer response: before vs after.
+
+"before" rebuilds the question and result dicts by hand and renders them
+through jsonable_encoder + JSONResponse, as the endpoint used to. "after"
+splices the pre-encoded question fragment into a pydantic-core rendered
+body (FastJSONResponse). Only response rendering is timed, not the
+classifier update.
+
+Run from the backend directory:
+    python benchmarks/bench_answer_serialization.py
+"""
+import os
+import sys
+import json
+import timeit
+import logging
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+os.chdir(backend_dir)
+logging.disable(logging.CRITICAL)
+
+from app.api.responses import FastJSONResponse, JSONFragment, render_json, render_object  # noqa: E402
+from app.core.classifier import TaqneeqClassifier  # noqa: E402
+
+ITERATIONS = 20000
+
+
+def message_for(result) -> str:
+    return f"Question {result.questions_asked} processed - {result.reasoning}"
+
+
+def render_before(next_question, result) -> bytes:
+    response_data = {
+        "next_question": {
+            "id": next_question.id,
+            "text": next_question.text,
+            "type": next_question.type,
+            "options": next_question.options,
+            "category": next_question.category,
+            "primary_trait": next_question.primary_trait,
+            "secondary_traits": next_question.secondary_traits,
+            "information_value": next_question.information_value,
+            "target_departments": next_question.target_departments,
+            "question_stage": next_question.question_stage
+        },
+        "classification_result": {
+            "session_id": result.session_id,
+            "top_department": result.top_department,
+            "top_probability": result.top_probability,
+            "secondary_department": result.secondary_department,
+            "secondary_probability": result.secondary_probability,
+            "all_probabilities": result.all_probabilities,
+            "questions_asked": result.questions_asked,
+            "confidence_level": result.confidence_level,
+            "should_continue": result.should_continue,
+            "is_complete": result.is_complete,
+            "current_top_traits": result.current_top_traits,
+            "reasoning": result.reasoning
+        },
+        "message": message_for(result)
+    }
+    return JSONResponse(content=jsonable_encoder(response_data)).body
+
+
+def render_after(question_payloads, next_question, result) -> bytes:
+    return FastJSONResponse(render_object((
+        ("next_question", question_payloads[next_question.id]),
+        ("classification_result", result),
+        ("message", message_for(result))
+    ))).body
+
+
+def main():
+    classifier = TaqneeqClassifier()
+    question_payloads = {
+        question_id: JSONFragment(render_json(question))
+        for question_id, question in classifier.questions.items()
+    }
+
+    session_id, question = classifier.start_session()
+    next_question, result = classifier.process_response(session_id, question.id, 4)
+    assert json.loads(render_before(next_question, result)) == json.loads(
+        render_after(question_payloads, next_question, result))
+
+    before = timeit.timeit(lambda: render_before(next_question, result), number=ITERATIONS)
+    after = timeit.timeit(lambda: render_after(question_payloads, next_question, result), number=ITERATIONS)
+
+    print(f"{'path':>8} {'us/response':>12}")
+    print(f"{'before':>8} {before / ITERATIONS * 1e6:>12.1f}")
+    print(f"{'after':>8} {after / ITERATIONS * 1e6:>12.1f}")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Answer-endpoint throughput with the SQLite session backend at 1, 2, 4 and 8 workers.
+
+Starts uvicorn with N worker processes sharing one SQLite (WAL) session
+database, then drives complete classification sessions from several
+client processes and reports answers per second.
+
+Run from the backend directory (RAG is disabled for the run):
+    python benchmarks/bench_answer_throughput.py
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+backend_dir = Path(__file__).resolve().parent.parent
+
+WORKER_COUNTS = [1, 2, 4, 8]
+PORT = 8765
+DURATION_SECONDS = 10.0
+CLIENT_PROCESSES = 4
+SESSIONS_PER_CLIENT = 16
+
+
+async def run_session_loop(client: httpx.AsyncClient, deadline: float, rng: random.Random) -> int:
+    answers = 0
+    while time.perf_counter() < deadline:
+        started = (await client.post("/api/v1/classification/start", json={})).json()
+        session_id, question = started["session_id"], started["first_question"]
+        while question and time.perf_counter() < deadline:
+            reply = (await client.post("/api/v1/classification/answer", json={
+                "session_id": session_id,
+                "question_id": question["id"],
+                "response": rng.randint(1, 5)
+            })).json()
+            question = reply["next_question"]
+            answers += 1
+    return answers
+
+
+async def run_client(seed: int) -> int:
+    deadline = time.perf_counter() + DURATION_SECONDS
+    limits = httpx.Limits(max_connections=SESSIONS_PER_CLIENT)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=30.0) as client:
+        counts = await asyncio.gather(*[
+            run_session_loop(client, deadline, random.Random(seed * 1000 + i))
+            for i in range(SESSIONS_PER_CLIENT)
+        ])
+    return sum(counts)
+
+
+def client_process(seed: int) -> int:
+    return asyncio.run(run_client(seed))
+
+
+def wait_until_ready(timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{PORT}/api/v1/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError("Server did not become ready")
+
+
+def measure(workers: int, db_file: str) -> float:
+    env = dict(
+        os.environ,
+        SESSION_BACKEND="sqlite",
+        SESSION_DB_FILE=db_file,
+        ENABLE_RAG="false"
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--port", str(PORT), "--workers", str(workers), "--log-level", "warning"],
+        cwd=backend_dir, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready()
+        with ProcessPoolExecutor(CLIENT_PROCESSES) as pool:
+            total = sum(pool.map(client_process, range(CLIENT_PROCESSES)))
+        return total / DURATION_SECONDS
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    print(f"{'workers':>8} {'answers/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in WORKER_COUNTS:
+            db_file = os.path.join(tmp, f"sessions-{workers}.db")
+            print(f"{workers:>8} {measure(workers, db_file):>10.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
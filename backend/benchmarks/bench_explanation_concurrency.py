@@ -0,0 +1,153 @@
+"""
+Answer latency while LLM explanations are in flight: before vs after.
+
+Runs benchmarks/stub_llm.py on a background thread and points the RAG
+engine's ChatOpenAI client at it. The retrieval table is filled from the
+department data, so neither FAISS nor sentence-transformers is needed,
+and the explanation cache is off so every explanation reaches the LLM.
+
+While EXPLANATIONS explanation requests are in flight, an answer is due
+every ANSWER_INTERVAL seconds; its latency counts from when it was due,
+so time the event loop spends blocked shows up as latency. "before" generates
+explanations with the blocking client call, as the endpoint used to;
+"after" uses generate_explanation_async.
+
+Needs langchain-openai. Run from the backend directory:
+    python benchmarks/bench_explanation_concurrency.py
+"""
+import os
+import sys
+import time
+import random
+import socket
+import asyncio
+import logging
+import threading
+import statistics
+from pathlib import Path
+
+import httpx
+import uvicorn
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir / "benchmarks"))
+os.chdir(backend_dir)
+os.environ.update(ENABLE_RAG="true", EXPLANATION_CACHE_SIZE="0", LLM_MAX_CONCURRENCY="8", LOG_ASYNC="false")
+
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from stub_llm import create_app  # noqa: E402
+from app.main import app  # noqa: E402
+from app.api.routes import classifier, rag_engine  # noqa: E402
+from app.rag.engine import DepartmentContext  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+
+LLM_LATENCY = 0.25
+EXPLANATIONS = 24
+ANSWER_INTERVAL = 0.005
+
+
+def start_stub() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(latency=LLM_LATENCY), host="127.0.0.1", port=port, log_level="warning"
+    ))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/v1"
+
+
+def prepare_engine(base_url: str):
+    rag_engine.llm = ChatOpenAI(
+        model_name="stub", openai_api_key="stub", openai_api_base=base_url, max_retries=0
+    )
+    rag_engine.vector_store = object()  # Retrieval is served from department_contexts below
+    rag_engine.department_contexts = {
+        dept_id: DepartmentContext([], dept.description, list(dept.core_responsibilities))
+        for dept_id, dept in classifier.departments.items()
+    }
+    rag_engine.initialized = True
+
+
+def completed_session(rng: random.Random) -> str:
+    session_id, question = classifier.start_session()
+    while question is not None:
+        question, _ = classifier.process_response(session_id, question.id, rng.randint(1, 5))
+    return session_id
+
+
+async def answer_loop(client: httpx.AsyncClient, stop: asyncio.Event, rng: random.Random) -> list:
+    latencies = []
+    due = time.perf_counter()
+    while not stop.is_set():
+        started = (await client.post("/api/v1/classification/start", json={})).json()
+        session_id, question = started["session_id"], started["first_question"]
+        while question and not stop.is_set():
+            due += ANSWER_INTERVAL
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            reply = (await client.post("/api/v1/classification/answer", json={
+                "session_id": session_id, "question_id": question["id"], "response": rng.randint(1, 5)
+            })).json()
+            latencies.append(time.perf_counter() - due)
+            question = reply["next_question"]
+    return latencies
+
+
+async def run(explanation_sessions: list) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120.0) as client:
+        stop = asyncio.Event()
+        answers = asyncio.create_task(answer_loop(client, stop, random.Random(1)))
+        await asyncio.sleep(0.2)  # Baseline answers before explanations start
+
+        started = time.perf_counter()
+        replies = await asyncio.gather(*[
+            client.post("/api/v1/classification/explanation", json={"session_id": session_id})
+            for session_id in explanation_sessions
+        ])
+        explanations_seconds = time.perf_counter() - started
+        stop.set()
+        latencies = await answers
+
+    assert all(reply.status_code == 200 for reply in replies)
+    latencies.sort()
+    return {
+        "answers": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "explanations_seconds": explanations_seconds
+    }
+
+
+def main():
+    prepare_engine(start_stub())
+    rng = random.Random(0)
+    sessions = [completed_session(rng) for _ in range(EXPLANATIONS)]
+
+    # Blocking call on the event loop, as the endpoint used to make
+    async def blocking_explanation(department_id, user_session):
+        return rag_engine.generate_explanation(department_id, user_session)
+
+    async_explanation = rag_engine.generate_explanation_async
+    rag_engine.generate_explanation_async = blocking_explanation
+    before = asyncio.run(run(sessions))
+    rag_engine.generate_explanation_async = async_explanation
+    after = asyncio.run(run(sessions))
+
+    print(f"{EXPLANATIONS} explanations (stub LLM latency {LLM_LATENCY}s) while answers are submitted")
+    for name, result in (("before (blocking)", before), ("after  (async)", after)):
+        print(
+            f"  {name}: answer p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms  "
+            f"max {result['max_ms']:7.1f} ms  ({result['answers']} answers), "
+            f"explanations done in {result['explanations_seconds']:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
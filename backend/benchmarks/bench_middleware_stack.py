@@ -0,0 +1,164 @@
+"""
+Requests/sec through the full middleware stack: before vs after.
+
+"before" registers the BaseHTTPMiddleware versions of LoggingMiddleware and
+SecurityHeadersMiddleware, as setup_middleware used to. "after" is
+setup_middleware as it is now (pure ASGI). Both stacks also include the
+CORS and GZip middleware and serve the same small JSON endpoint, driven
+in-process with raw ASGI messages so no network or client cost is timed.
+Response headers are checked to be identical apart from per-request
+values.
+
+Run from the backend directory:
+    python benchmarks/bench_middleware_stack.py
+"""
+import os
+import sys
+import time
+import uuid
+import asyncio
+import logging
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+os.chdir(backend_dir)
+logging.disable(logging.CRITICAL)
+
+from app.api.middleware import setup_middleware  # noqa: E402
+from app.config import settings  # noqa: E402
+
+REQUESTS = 20000
+logger = logging.getLogger(__name__)
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())[:8]
+        start_time = time.time()
+        logger.info(
+            f"Request {request_id}: {request.method} {request.url.path} "
+            f"from {request.client.host if request.client else 'unknown'}"
+        )
+        request.state.request_id = request_id
+        try:
+            response = await call_next(request)
+            duration = time.time() - start_time
+            logger.info(f"Response {request_id}: {response.status_code} in {duration:.3f}s")
+            response.headers["X-Request-ID"] = request_id
+            response.headers["X-Response-Time"] = f"{duration:.3f}s"
+            return response
+        except Exception as e:
+            duration = time.time() - start_time
+            logger.error(f"Error {request_id}: {str(e)} after {duration:.3f}s", exc_info=True)
+            raise
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        return response
+
+
+def add_endpoint(app: FastAPI) -> FastAPI:
+    @app.get("/ping")
+    async def ping(request: Request):
+        return {"status": "ok", "request_id": request.state.request_id}
+    return app
+
+
+def legacy_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["*"],
+        expose_headers=["X-Request-ID", "X-Response-Time"]
+    )
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.add_middleware(LegacySecurityHeadersMiddleware)
+    app.add_middleware(LegacyLoggingMiddleware)
+    return add_endpoint(app)
+
+
+def current_app() -> FastAPI:
+    app = FastAPI()
+    setup_middleware(app)
+    return add_endpoint(app)
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"testserver"), (b"accept-encoding", b"gzip")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("testserver", 80),
+}
+
+
+async def request(app) -> list:
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(dict(SCOPE), receive, send)
+    return sent
+
+
+def response_headers(messages) -> list:
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    volatile = {b"x-request-id", b"x-response-time", b"content-length"}
+    return [(k, v) for k, v in start["headers"] if k not in volatile]
+
+
+async def requests_per_second(app) -> float:
+    for _ in range(500):
+        await request(app)
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await request(app)
+    return REQUESTS / (time.perf_counter() - started)
+
+
+async def main():
+    before, after = legacy_app(), current_app()
+
+    before_headers = response_headers(await request(before))
+    after_headers = response_headers(await request(after))
+    assert before_headers == after_headers, (before_headers, after_headers)
+    print("Response headers (excluding per-request values):")
+    for name, value in after_headers:
+        print(f"  {name.decode()}: {value.decode()}")
+
+    before_rps = await requests_per_second(before)
+    after_rps = await requests_per_second(after)
+    print(f"\n{REQUESTS} requests through CORS + GZip + security headers + logging")
+    print(f"  before (BaseHTTPMiddleware): {before_rps:8.0f} req/s")
+    print(f"  after  (pure ASGI):          {after_rps:8.0f} req/s")
+    print(f"  speedup: {after_rps / before_rps:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
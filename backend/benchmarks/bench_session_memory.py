@@ -0,0 +1,102 @@
+"""
+Heap bytes per classification session: pydantic model vs compact record.
+
+The legacy layout (string-keyed trait/probability dicts plus a list of
+pydantic UserResponse objects with datetimes) is reproduced here for
+comparison against the current __slots__/array-backed Session.
+
+Run from the backend directory:
+    python benchmarks/bench_session_memory.py
+"""
+import os
+import sys
+import gc
+import uuid
+import logging
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+os.chdir(backend_dir)
+logging.disable(logging.CRITICAL)
+
+from app.core.classifier import TaqneeqClassifier  # noqa: E402
+from app.core.models import Session, SessionState, UserResponse  # noqa: E402
+from app.core.utils import TRAIT_NAMES  # noqa: E402
+
+NUM_SESSIONS = 5000
+ANSWERS_PER_SESSION = 12
+
+
+class LegacySession(BaseModel):
+    """Session layout before the compact record"""
+    session_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    state: SessionState = SessionState.INITIALIZED
+    trait_scores: Dict[str, float] = Field(default_factory=dict)
+    department_probabilities: Dict[str, float] = Field(default_factory=dict)
+    responses: List[UserResponse] = []
+    questions_asked: List[str] = []
+    created_at: datetime = Field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+    last_activity: datetime = Field(default_factory=datetime.now)
+
+
+def build_legacy(classifier: TaqneeqClassifier, question_ids: List[str]) -> LegacySession:
+    session = LegacySession()
+    session.trait_scores = {trait: 0.5 + i * 1e-3 for i, trait in enumerate(TRAIT_NAMES)}
+    session.department_probabilities = {
+        dept_id: 1.0 / len(classifier.department_ids) + i * 1e-4
+        for i, dept_id in enumerate(classifier.department_ids)
+    }
+    for i, question_id in enumerate(question_ids):
+        session.responses.append(UserResponse(question_id=question_id, response=(i % 5) + 1))
+        session.questions_asked.append(question_id)
+    return session
+
+
+def build_compact(classifier: TaqneeqClassifier, question_ids: List[str]) -> Session:
+    session = classifier._new_session()
+    session.trait_scores = session.trait_scores + 1e-3
+    session.probabilities = session.probabilities + 1e-4
+    for i, question_id in enumerate(question_ids):
+        row = classifier.question_operators[question_id].row
+        session.record_response(row, (i % 5) + 1, 1.0)
+        session.asked_mask[row] = True
+        session.trait_question_counts[classifier.question_primary[row]] += 1
+    return session
+
+
+def bytes_per_session(builder, classifier: TaqneeqClassifier, question_ids: List[str]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sessions = [builder(classifier, question_ids) for _ in range(NUM_SESSIONS)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del sessions
+    return allocated / NUM_SESSIONS
+
+
+def main():
+    classifier = TaqneeqClassifier()
+    question_ids = [q.id for q in classifier.question_by_row[:ANSWERS_PER_SESSION]]
+
+    legacy = bytes_per_session(build_legacy, classifier, question_ids)
+    compact = bytes_per_session(build_compact, classifier, question_ids)
+
+    print(f"{NUM_SESSIONS} sessions x {ANSWERS_PER_SESSION} answers")
+    print(f"{'layout':>10} {'bytes/session':>14}")
+    print(f"{'pydantic':>10} {legacy:>14.0f}")
+    print(f"{'compact':>10} {compact:>14.0f}")
+    print(f"reduction: {legacy / compact:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
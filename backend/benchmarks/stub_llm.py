@@ -0,0 +1,120 @@
+"""
+Local stand-in for the OpenAI chat completions API, for offline load tests.
+
+Answers every /v1/chat/completions request with a canned explanation in
+the sections EXPLANATION_PROMPT asks for, after a configurable delay.
+Streaming requests (stream=true) get OpenAI-style SSE chunks, one word
+per chunk.
+
+Run from the backend directory:
+    python benchmarks/stub_llm.py --port 8900 --latency 1.5 --token-delay 0.02
+
+and point the classifier at it:
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8900/v1 python run.py
+"""
+import re
+import json
+import time
+import uuid
+import asyncio
+import argparse
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEPARTMENT_PATTERN = re.compile(r"recommended for the (.+?) department")
+
+RESPONSE_TEMPLATE = """## Overview
+You are a strong match for the {department} department based on your answers.
+
+## Why You're a Good Fit
+Your strongest traits line up with the work {department} does every day, and your answers show you enjoy it.
+
+## What You'll Do
+You will plan and run {department} activities with the team, from early preparation through the festival itself.
+
+## Skills You'll Gain
+You will build practical experience, teamwork and ownership of real deliverables.
+
+## Next Steps
+Apply to {department} and talk to current members about the projects running this year.
+"""
+
+
+def create_app(latency: float = 1.0, token_delay: float = 0.0) -> FastAPI:
+    """
+    Stub app: ``latency`` seconds pass before the first token and
+    ``token_delay`` seconds between tokens
+    """
+    app = FastAPI(title="Stub LLM")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+        match = DEPARTMENT_PATTERN.search(prompt)
+        text = RESPONSE_TEMPLATE.format(department=match.group(1) if match else "recommended")
+        tokens = re.findall(r"\s*\S+", text)
+        model = body.get("model", "stub")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        await asyncio.sleep(latency)
+
+        if not body.get("stream"):
+            await asyncio.sleep(token_delay * len(tokens))
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": len(prompt.split()),
+                    "completion_tokens": len(tokens),
+                    "total_tokens": len(prompt.split()) + len(tokens)
+                }
+            })
+
+        def chunk(delta, finish_reason=None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events():
+            yield chunk({"role": "assistant", "content": ""})
+            for token in tokens:
+                yield chunk({"content": token})
+                if token_delay:
+                    await asyncio.sleep(token_delay)
+            yield chunk({}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub LLM with configurable latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=1.0, help="Seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between tokens")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args.latency, args.token_delay), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
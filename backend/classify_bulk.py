@@ -0,0 +1,88 @@
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Ensure we can import the app
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+
+def open_output(path: str):
+    if path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score exported answer sheets (JSONL or CSV) with the Taqneeq classifier"
+    )
+    parser.add_argument("input", help="Answer sheet file, or - for stdin")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None,
+                        help="Input format (default: from the file extension)")
+    parser.add_argument("--output", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--output-format", choices=["jsonl", "csv"], default="jsonl",
+                        help="jsonl (one result object per line) or csv (one column per department)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: BULK_WORKERS setting, 0 = one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Answer sheets per worker task (default: BULK_CHUNK_SIZE setting)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+
+    logging.basicConfig(level=logging.WARNING)
+    from app.config import settings
+    from app.core.bulk import AnswerSheetParser, BulkClassifier
+    from app.core.classifier import TaqneeqClassifier
+
+    classifier = TaqneeqClassifier()
+    bulk = BulkClassifier(
+        classifier,
+        settings.BULK_WORKERS if args.workers is None else args.workers,
+        args.chunk_size or settings.BULK_CHUNK_SIZE
+    )
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    output = open_output(args.output)
+    started = time.perf_counter()
+    rows = errors = 0
+
+    try:
+        writer = None
+        if args.output_format == "csv":
+            writer = csv.writer(output)
+            writer.writerow(
+                ["id", "top_department", "top_probability", "questions_answered", "error"]
+                + classifier.department_ids
+            )
+
+        for row in bulk.classify(AnswerSheetParser(fmt, classifier.questions).parse_lines(source)):
+            rows += 1
+            errors += "error" in row
+            if writer is None:
+                output.write(json.dumps(row) + "\n")
+            else:
+                probabilities = row.get("all_probabilities", {})
+                writer.writerow(
+                    [row["id"], row.get("top_department", ""), row.get("top_probability", ""),
+                     row.get("questions_answered", ""), row.get("error", "")]
+                    + [probabilities.get(dept_id, "") for dept_id in classifier.department_ids]
+                )
+    finally:
+        bulk.close()
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Classified {rows} answer sheets ({errors} errors) in {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
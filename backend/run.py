@@ -1,21 +1,173 @@
-import sys
+import argparse
+import gc
 import os
+import select
+import signal
+import sys
 from pathlib import Path
 
 # Ensure we can import the app
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+
+def serve_prefork(app, settings, workers: int):
+    """
+    Load everything once in this master process, then fork ``workers``
+    uvicorn servers that share the loaded data copy-on-write. The RAG
+    index and department contexts are prepared here too; each worker
+    only creates its own LLM client.
+
+    Dead workers are respawned (including ones that exit after
+    WORKER_MAX_REQUESTS requests); SIGHUP replaces every worker gracefully.
+    """
+    import uvicorn
+    from app.api.routes import rag_engine
+    from app.logging_config import stop_logging
+
+    config = uvicorn.Config(
+        app,
+        host=settings.HOST,
+        port=settings.PORT,
+        log_level="info",
+        limit_max_requests=settings.WORKER_MAX_REQUESTS or None
+    )
+    sock = config.bind_socket()
+
+    if rag_engine:
+        rag_engine.prepare_for_fork()
+
+    # Keep the loaded objects out of GC scans so workers don't dirty shared pages
+    gc.collect()
+    gc.freeze()
+
+    children = {}       # pid -> worker slot
+    retiring = set()    # pids asked to stop during a rolling restart
+    shutting_down = False
+    stop_requested = False
+    restart_requested = False
+
+    # Signal handlers only set flags; the loop below acts on them. The wakeup
+    # pipe (written for every handled signal, SIGCHLD included) ends its wait.
+    wake_read, wake_write = os.pipe()
+    os.set_blocking(wake_read, False)
+    os.set_blocking(wake_write, False)
+
+    def spawn(slot: int):
+        pid = os.fork()
+        if pid == 0:
+            signal.set_wakeup_fd(-1)
+            os.close(wake_read)
+            os.close(wake_write)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            try:
+                uvicorn.Server(config).run(sockets=[sock])
+            finally:
+                stop_logging()
+                os._exit(0)
+        children[pid] = slot
+        print(f"👷 Worker {slot} started (pid {pid})")
+
+    def request_stop(signum, frame):
+        nonlocal stop_requested
+        stop_requested = True
+
+    def request_restart(signum, frame):
+        nonlocal restart_requested
+        restart_requested = True
+
+    def stop_all():
+        for pid in list(children):
+            os.kill(pid, signal.SIGTERM)
+
+    def rolling_restart():
+        print("🔄 Recycling workers...")
+        for pid, slot in list(children.items()):
+            if pid in retiring:
+                continue
+            spawn(slot)
+            retiring.add(pid)
+            os.kill(pid, signal.SIGTERM)
+
+    def reap() -> bool:
+        """Handle exited workers; False once no children are left"""
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return False
+            if pid == 0:
+                return True
+            slot = children.pop(pid, None)
+            if pid in retiring:
+                retiring.discard(pid)
+            elif slot is not None and not shutting_down:
+                print(f"♻️  Worker {slot} exited (pid {pid}), respawning")
+                spawn(slot)
+
+    signal.set_wakeup_fd(wake_write)
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGHUP, request_restart)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    for slot in range(workers):
+        spawn(slot)
+
+    while children:
+        select.select([wake_read], [], [], 1.0)
+        try:
+            while os.read(wake_read, 512):
+                pass
+        except BlockingIOError:
+            pass
+
+        if stop_requested and not shutting_down:
+            shutting_down = True
+            stop_all()
+        if restart_requested:
+            restart_requested = False
+            if not shutting_down:
+                rolling_restart()
+        if not reap():
+            break
+
+    signal.set_wakeup_fd(-1)
+    os.close(wake_read)
+    os.close(wake_write)
+    sock.close()
+    print("👋 All workers stopped")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Taqneeq Department Classifier server")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of pre-forked worker processes (default: WORKERS setting)")
+    args = parser.parse_args()
+
     print("🚀 Starting Taqneeq Department Classifier...")
     print("🌐 Server: http://localhost:8000")
     print("📖 API Docs: http://localhost:8000/docs")
     print("=" * 50)
-    
+
     try:
         import uvicorn
+        from app.config import settings
+
+        workers = args.workers if args.workers is not None else settings.WORKERS
+        if workers > 1 and settings.SESSION_BACKEND.lower() == "memory":
+            print("❌ Multiple workers need a shared session store: set SESSION_BACKEND=sqlite")
+            sys.exit(1)
+
         from app.main import app
-        
+
+        if workers > 1:
+            serve_prefork(app, settings, workers)
+            return
+
         uvicorn.run(
             app,
             host="0.0.0.0",
@@ -23,7 +175,7 @@ def main():
             reload=False,  # Disable reload to avoid multiprocessing issues
             log_level="info"
         )
-        
+
     except ImportError as e:
         print(f"❌ Import error: {e}")
         print("Make sure you've installed: pip install fastapi uvicorn pydantic pydantic-settings")
@@ -33,4 +185,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()